@@ -7,35 +7,487 @@ Comprehensive web interface with API wizard integration
 import os
 import sys
 import json
-import yaml
 import logging
 import pathlib
 import base64
+import shutil
+import time
+import atexit
+import contextlib
+import importlib.util
+import io
+import functools
+import subprocess
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from datetime import datetime, timedelta
-import pandas as pd
-import plotly.graph_objs as go
-import plotly.express as px
-from plotly.subplots import make_subplots
 
 import dash
-from dash import dcc, html, Input, Output, State, callback_context
+from dash import dcc, html, Input, Output, State, ALL, Patch, callback_context, ClientsideFunction
 from dash.exceptions import PreventUpdate
 import dash_bootstrap_components as dbc
+import flask
+from flask import request as flask_request
+from flask.json.provider import JSONProvider
+import plotly.io as pio
+
+from config_cache import load_config_file
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-# Import our modules
 try:
-    from api_wizard import APIWizard
-    from video_processor import create_video_processor
-    from self_heal import create_self_heal_toolchain
-    from packager import create_packager
+    import dash_uploader as du
 except ImportError:
-    print("Some modules not available - running in basic mode")
+    du = None
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Dash app settings shared by every dashboard instance
+_EXTERNAL_STYLESHEETS = [dbc.themes.DARKLY]
+# sw.js is served from /sw.js as a service worker, never as a page script
+_ASSETS_IGNORE = r'.*\.(md|txt|map)$|^sw\.js$'
+
+# Interpreter version shown in the status panel
+_PY_VERSION = sys.version.split()[0]
+
+@functools.lru_cache(maxsize=1)
+def _resolved_endpoint():
+    """Return the (host, port) the dashboard binds to, read from the environment once"""
+    host = os.environ.get('TRENDCLIP_BIND', '127.0.0.1')
+    port = int(os.environ.get('TRENDCLIP_PORT', 8700))
+    return host, port
+
+# Base64 slice size for decoding uploads (must be a multiple of 4)
+_B64_CHUNK = 64 * 1024
+
+# Files up to this size are read whole and added with ZipFile.writestr
+_ZIP_INLINE_MAX = 1024 * 1024
+
+
+# Default-application opener, chosen once for this platform
+if os.name == "nt":
+    def _open_path(path: str):
+        os.startfile(path)
+else:
+    _OPEN_COMMAND = "open" if sys.platform == "darwin" else "xdg-open"
+    
+    def _open_path(path: str):
+        # Detach so the child never holds or blocks on the server's stdio
+        subprocess.Popen(
+            [_OPEN_COMMAND, path],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+
+def _tail_text(path, chars: int) -> str:
+    """Return the last chars characters of a UTF-8 file without reading all of it"""
+    try:
+        with open(path, 'rb') as f:
+            end = f.seek(0, os.SEEK_END)
+            # Over-read so multibyte sequences at the cut are not an issue
+            f.seek(max(0, end - 2 * chars - 4096))
+            return f.read().decode('utf-8', errors='replace')[-chars:]
+    except FileNotFoundError:
+        return ""
+
+@contextlib.contextmanager
+def _on_sys_path(directory: str):
+    """Put directory first on sys.path for the duration of the block"""
+    added = directory not in sys.path
+    if added:
+        sys.path.insert(0, directory)
+    try:
+        yield
+    finally:
+        if added:
+            try:
+                sys.path.remove(directory)
+            except ValueError:
+                pass
+
+@contextlib.contextmanager
+def _in_directory(directory: str):
+    """Make directory the working directory for the duration of the block"""
+    previous = os.getcwd()
+    os.chdir(directory)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+def _load_autopilot_main(script_path: str):
+    """Import autopilot.py and return its main(), if it has one (call inside _on_sys_path)"""
+    try:
+        spec = importlib.util.spec_from_file_location("autopilot", script_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        main = getattr(module, "main", None)
+        return main if callable(main) else None
+    except Exception as e:
+        logger.warning(f"Cannot import autopilot in-process: {e}")
+        return None
+
+class _LineWriter(io.TextIOBase):
+    """Text stream that passes each complete line to a callback"""
+    
+    def __init__(self, on_line):
+        self.on_line = on_line
+        self._partial = ""
+    
+    def write(self, text):
+        lines = (self._partial + text).split("\n")
+        self._partial = lines.pop()
+        for line in lines:
+            self.on_line(line)
+        return len(text)
+    
+    def flush(self):
+        if self._partial:
+            self.on_line(self._partial)
+            self._partial = ""
+
+def _run_autopilot_main(main, on_line) -> int:
+    """Run autopilot's main() in this process, passing its output to on_line line by line
+    
+    print() output is captured by swapping sys.stdout/sys.stderr; log records
+    from this thread are captured by a temporary root handler, since handlers
+    that were bound to the original stderr bypass the swap. Loggers with
+    propagate=False that write straight to a stream are not captured.
+    """
+    writer = _LineWriter(on_line)
+    handler = logging.StreamHandler(writer)
+    handler.setFormatter(logging.Formatter("%(levelname)s %(name)s: %(message)s"))
+    thread_id = threading.get_ident()
+    handler.addFilter(lambda record: record.thread == thread_id)
+    root = logging.getLogger()
+    root.addHandler(handler)
+    try:
+        with contextlib.redirect_stdout(writer), contextlib.redirect_stderr(writer):
+            result = main()
+        returncode = result if isinstance(result, int) else 0
+    except SystemExit as e:
+        returncode = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    finally:
+        root.removeHandler(handler)
+        writer.flush()
+    return returncode
+
+def _iter_files(root: str):
+    """Yield os.DirEntry objects for all files under root (iterative, no symlinks)"""
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            yield entry
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+def _json_loads(data):
+    """Parse JSON from str or bytes (orjson when available)"""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+class ORJSONProvider(JSONProvider):
+    """Flask JSON provider backed by orjson"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=str, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+if orjson is not None:
+    # Dash encodes layouts and callback responses through plotly's JSON engine
+    pio.json.config.default_engine = "orjson"
+
+# Column types of stats/clipstats.csv (see DESIGN.md)
+_STATS_DTYPES = {
+    'timestamp': 'string',
+    'title': 'string',
+    'video_id': 'string',
+    'source_url': 'string',
+    'seconds': 'float64',
+    'views': 'float64',
+    'cpm_gbp': 'float64',
+    'est_gbp': 'float64',
+    'clip_path': 'string',
+    'thumb_path': 'string',
+    'status': 'string'
+}
+
+# Static tab layouts, built once at import time
+# Overview tab
+_OVERVIEW_TAB = dbc.Row([
+    # System Status
+    dbc.Col([
+        dbc.Card([
+            dbc.CardHeader("System Status"),
+            dbc.CardBody([
+                html.Div(id="system-status"),
+                dbc.Button("Refresh Status", id="refresh-status", color="primary", className="mt-2")
+            ])
+        ])
+    ], width=6),
+
+    # Quick Actions
+    dbc.Col([
+        dbc.Card([
+            dbc.CardHeader("Quick Actions"),
+            dbc.CardBody([
+                dbc.Button("Run API Wizard", id={"type": "quick-action", "action": "api-wizard"}, color="success", className="me-2 mb-2"),
+                dbc.Button("Self-Heal Tools", id={"type": "quick-action", "action": "self-heal"}, color="warning", className="me-2 mb-2"),
+                dbc.Button("Create Package", id={"type": "quick-action", "action": "create-package"}, color="info", className="me-2 mb-2"),
+                dbc.Button("Open Folders", id={"type": "quick-action", "action": "open-folders"}, color="secondary", className="mb-2"),
+                html.Div(id="quick-actions-output", className="mt-3"),
+                dcc.Interval(id="quick-actions-poll", interval=1000, disabled=True)
+            ])
+        ])
+    ], width=6),
+
+    # Demo Chart
+    dbc.Col([
+        dbc.Card([
+            dbc.CardHeader("Demo Chart"),
+            dbc.CardBody([
+                # Plain figure dict so the module does not need plotly.express/pandas
+                dcc.Graph(id="demo-graph", figure={
+                    "data": [{"type": "scatter", "mode": "lines",
+                              "x": list(range(10)), "y": [i*i for i in range(10)]}],
+                    "layout": {"title": {"text": "Demo chart"}}
+                })
+            ])
+        ])
+    ], width=12, className="mt-3")
+])
+
+# API setup tab with inline paste/upload functionality
+_API_SETUP_TAB = dbc.Row([
+    dbc.Col([
+        dbc.Card([
+            dbc.CardHeader("API & Auth"),
+            dbc.CardBody([
+                html.P("Create a Google OAuth client (Desktop) and place client_secret.json into .secrets. You can paste JSON or upload the file here."),
+                html.Ul([
+                    html.Li(html.A("Google Cloud Console", href="https://console.cloud.google.com/", className="link", target="_blank")),
+                    html.Li(html.A("Create OAuth client (Desktop)", href="https://console.cloud.google.com/apis/credentials/oauthclient", className="link", target="_blank")),
+                    html.Li(html.A("Enable YouTube Data API v3", href="https://console.cloud.google.com/apis/library/youtube.googleapis.com", className="link", target="_blank")),
+                ]),
+                html.Label("Paste client_secret.json contents"),
+                dcc.Textarea(id="client-json", value="", style={"width":"100%","height":"140px"}),
+                html.Div(style={"marginTop":"8px"}),
+                html.Label("Or select client_secret.json file"),
+                dcc.Upload(id="upload-client-json", children=html.Div(["Drag & Drop or ", html.A("Select file")]), multiple=False),
+                html.Div(style={"marginTop":"8px"}),
+                html.Label("Or paste a file path to client_secret.json"),
+                dcc.Input(id="client-path", type="text", value="", style={"width":"100%"}),
+                html.Div(style={"marginTop":"10px"}, children=[
+                    dbc.Button("Save client_secret.json", id="btn-save-secret", color="success", className="me-2"),
+                    dbc.Button("Clear token.json", id="btn-clear-token", color="warning", className="me-2"),
+                    dbc.Button("Test YouTube Login", id="btn-test-auth", color="info", className="me-2"),
+                    dbc.Button("Open .secrets", id="btn-open-secrets", color="secondary")
+                ]),
+                html.Div(id="api-status", style={"whiteSpace":"pre-wrap","marginTop":"10px"}),
+            ])
+        ])
+    ], width=12)
+])
+
+# YouTube upload tab
+_PRIVACY_OPTIONS = tuple({"label": v, "value": v} for v in ("private", "unlisted", "public"))
+
+if du is not None:
+    # Streams the file to dist/uploads in binary chunks (no base64 data URL)
+    _VIDEO_UPLOAD = du.Upload(id="upload-video", text="Drag & Drop or Select video", max_file_size=5000)
+else:
+    _VIDEO_UPLOAD = dcc.Upload(id="upload-video", children=html.Div(["Drag & Drop or ", html.A("Select video")]), multiple=False)
+
+_UPLOAD_TAB = dbc.Row([
+    dbc.Col([
+        dbc.Card([
+            dbc.CardHeader("YouTube Upload (Shorts)"),
+            dbc.CardBody([
+                _VIDEO_UPLOAD,
+                html.Br(), 
+                html.Label("Title"), 
+                dcc.Input(id="yt-title", type="text", value="My TrendClip", style={"width":"100%"}),
+                html.Br(), 
+                html.Label("Description"), 
+                dcc.Textarea(id="yt-desc", value="", style={"width":"100%","height":"100px"}),
+                html.Br(), 
+                html.Label("Tags (comma separated)"), 
+                dcc.Input(id="yt-tags", type="text", value="trendclip,shorts", style={"width":"100%"}),
+                html.Br(), 
+                html.Label("Privacy"), 
+                dcc.Dropdown(id="yt-privacy", options=_PRIVACY_OPTIONS, value="private"),
+                html.Br(), 
+                dbc.Button("Upload", id="btn-upload", color="primary"),
+                html.Div(id="upload-status", style={"whiteSpace":"pre-wrap","marginTop":"10px"}),
+            ])
+        ])
+    ], width=12)
+])
+
+# Trending tab (static parts; the region select depends on config)
+_REGION_OPTIONS = (
+    {"label": "United Kingdom", "value": "GB"},
+    {"label": "United States", "value": "US"},
+    {"label": "Canada", "value": "CA"},
+    {"label": "Australia", "value": "AU"}
+)
+
+_TRENDING_LIMIT_COL = dbc.Col([
+    dbc.Label("Limit"),
+    dbc.Input(
+        id="trending-limit",
+        type="number",
+        value=50,
+        min=10,
+        max=200
+    )
+], width=4)
+
+_TRENDING_FETCH_COL = dbc.Col([
+    dbc.Button("Fetch Trends", id="fetch-trends", color="primary", className="mt-4")
+], width=4)
+
+_TRENDING_RESULTS_COL = dbc.Col([
+    dbc.Card([
+        dbc.CardHeader("Trending Videos"),
+        dbc.CardBody([
+            html.Div(id="trending-results")
+        ])
+    ])
+], width=12, className="mt-3")
+
+@functools.lru_cache(maxsize=None)
+def _build_trending_tab(region: str):
+    """Build the trending tab for a default region (one tree per region)"""
+    region_select = dbc.Select(
+        id="trending-region",
+        options=_REGION_OPTIONS,
+        value=region
+    )
+    return dbc.Row([
+        # Trending Controls
+        dbc.Col([
+            dbc.Card([
+                dbc.CardHeader("Trending Controls"),
+                dbc.CardBody([
+                    dbc.Row([
+                        dbc.Col([dbc.Label("Region"), region_select], width=4),
+                        _TRENDING_LIMIT_COL,
+                        _TRENDING_FETCH_COL
+                    ]),
+                    html.Div(id="trending-output", className="mt-3")
+                ])
+            ])
+        ], width=12),
+
+        # Trending Results
+        _TRENDING_RESULTS_COL
+    ])
+
+# Analytics tab
+_ANALYTICS_TAB = dbc.Row([
+    # Analytics Overview
+    dbc.Col([
+        dbc.Card([
+            dbc.CardHeader("Analytics Overview"),
+            dbc.CardBody([
+                html.Div(id="analytics-overview"),
+                dcc.Store(id="analytics-data")
+            ])
+        ])
+    ], width=12),
+
+    # Charts
+    dbc.Col([
+        dbc.Card([
+            dbc.CardHeader("Performance Charts"),
+            dbc.CardBody([
+                # Figures are built in the browser (assets/analytics.js)
+                dcc.Graph(id="views-chart", config={"plotGlPixelRatio": 1}),
+                dcc.Graph(id="revenue-chart", config={"plotGlPixelRatio": 1})
+            ])
+        ])
+    ], width=12, className="mt-3")
+])
+
+# Tools tab
+_TOOLS_TAB = dbc.Row([
+    # Self-Test
+    dbc.Col([
+        dbc.Card([
+            dbc.CardHeader("Self-Test"),
+            dbc.CardBody([
+                dbc.Button("Run Self-Test", id="btn-selftest", color="primary", className="me-2"),
+                dbc.Button("Open Logs Folder", id="btn-open-logs", color="secondary"),
+                html.Div(id="selftest-output", style={"whiteSpace":"pre-wrap","marginTop":"10px"}),
+                dcc.Graph(id="selftest-figure", figure={
+                    "data": [{"type": "scatter", "mode": "markers", "x": [], "y": []}],
+                    "layout": {"title": {"text": "Self-test"}}
+                }),
+            ])
+        ])
+    ], width=6),
+
+    # Packager
+    dbc.Col([
+        dbc.Card([
+            dbc.CardHeader("Packager"),
+            dbc.CardBody([
+                html.P("Create a distributable ZIP (no venv/tokens)."),
+                dbc.Button("Create ZIP", id="btn-pack", color="info"),
+                html.Div(id="pack-status", style={"whiteSpace":"pre-wrap","marginTop":"10px"}),
+            ])
+        ])
+    ], width=6),
+
+    # System Tools
+    dbc.Col([
+        dbc.Card([
+            dbc.CardHeader("System Tools"),
+            dbc.CardBody([
+                dbc.Button("Check Tools", id="check-tools", color="info", className="me-2"),
+                dbc.Button("Install Missing", id="install-missing", color="warning", className="me-2"),
+                dbc.Button("Create Package", id="create-package-tools", color="secondary"),
+                html.Div(id="system-tools-output", className="mt-3")
+            ])
+        ])
+    ], width=12, className="mt-3")
+])
+
+# Autopilot tab
+_AUTOPILOT_TAB = dbc.Row([
+    dbc.Col([
+        dbc.Card([
+            dbc.CardHeader("Autopilot"),
+            dbc.CardBody([
+                html.P("Edit urls.txt, then run one cycle. Outputs to /dist."),
+                dbc.Button("Open urls.txt", id="btn-open-urls", color="primary", className="me-2"),
+                dbc.Button("Open dist Folder", id="btn-open-dist", color="secondary", className="me-2"),
+                dbc.Button("Run Once", id="btn-do1", color="success"),
+                html.Div(id="do1-progress", style={"whiteSpace":"pre-wrap","marginTop":"10px"}),
+                html.Div(id="do1-status", style={"whiteSpace":"pre-wrap","marginTop":"10px"}),
+            ])
+        ])
+    ], width=12)
+])
+
 class TrendClipDashboard:
     """Main dashboard application"""
     
@@ -47,6 +499,13 @@ class TrendClipDashboard:
         self.stats_file = self.base_path / "stats" / "clipstats.csv"
         self.secrets_dir = self.base_path / ".secrets"
         self.dist_dir = self.base_path / "dist"
+        self.uploads_dir = self.dist_dir / "uploads"
+        self.client_secret_file = self.secrets_dir / "client_secret.json"
+        self.token_file = self.secrets_dir / "token.json"
+        self.urls_file = self.base_path / "urls.txt"
+        self.autopilot_script = self.base_path / "autopilot.py"
+        self.autopilot_log = self.logs_dir / "autopilot.log"
+        self.selftest_file = self.logs_dir / "selftest.txt"
         
         # Ensure directories exist
         for dir_path in [self.logs_dir, self.clips_dir, self.secrets_dir, self.dist_dir]:
@@ -54,6 +513,19 @@ class TrendClipDashboard:
         
         # Load configuration
         self.config = self.load_config()
+        self._region = self.config.get('region', 'GB')
+        
+        # Short-lived cache for status probes: key -> (timestamp, value)
+        self._status_cache = {}
+        
+        # Shared pool for running status probes concurrently
+        self._probe_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="status-probe")
+        atexit.register(self._probe_pool.shutdown, wait=False)
+        
+        # Long-running quick actions run here, off the callback thread: action -> Future
+        self._job_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="quick-action")
+        atexit.register(self._job_pool.shutdown, wait=False)
+        self._jobs = {}
         
         # Initialize components
         self.api_wizard = None
@@ -61,30 +533,54 @@ class TrendClipDashboard:
         self.self_heal = None
         self.packager = None
         
+        # Each component is imported on its own so one missing module does not
+        # disable the rest; the packager is only imported when first used
         try:
+            from api_wizard import APIWizard
             self.api_wizard = APIWizard(str(self.base_path))
+        except Exception as e:
+            logger.warning(f"API wizard not available: {e}")
+        
+        try:
+            from video_processor import create_video_processor
             self.video_processor = create_video_processor(self.config)
+        except Exception as e:
+            logger.warning(f"Video processor not available: {e}")
+        
+        try:
+            from self_heal import create_self_heal_toolchain
             self.self_heal = create_self_heal_toolchain(str(self.base_path))
-            self.packager = create_packager(str(self.base_path))
         except Exception as e:
-            logger.warning(f"Some components not available: {e}")
+            logger.warning(f"Self-heal toolchain not available: {e}")
+        
+        # Long-running callbacks run in worker processes when diskcache is available
+        self.background_manager = None
+        try:
+            import diskcache
+            from dash import DiskcacheManager
+            self.background_manager = DiskcacheManager(diskcache.Cache(str(self.base_path / "cache")))
+        except ImportError:
+            logger.info("diskcache not installed - long-running actions will block their request")
         
         # Initialize Dash app
         self.app = dash.Dash(
             __name__,
-            external_stylesheets=[dbc.themes.DARKLY],
-            suppress_callback_exceptions=True
+            external_stylesheets=_EXTERNAL_STYLESHEETS,
+            suppress_callback_exceptions=True,
+            assets_ignore=_ASSETS_IGNORE,
+            update_title=None,
+            background_callback_manager=self.background_manager
         )
+        self.configure_server()
         
         self.setup_layout()
         self.setup_callbacks()
     
     def load_config(self) -> dict:
-        """Load configuration from YAML file"""
+        """Load configuration from YAML file (via a JSON cache when fresh)"""
         try:
             if self.config_file.exists():
-                with open(self.config_file, 'r') as f:
-                    return yaml.safe_load(f) or {}
+                return load_config_file(self.config_file)
         except Exception as e:
             logger.error(f"Failed to load config: {e}")
         
@@ -107,6 +603,164 @@ class TrendClipDashboard:
             }
         }
     
+    def configure_server(self):
+        """Enable fast JSON, response compression and long-lived caching of component bundles"""
+        server = self.app.server
+        
+        if orjson is not None:
+            server.json = ORJSONProvider(server)
+        
+        if du is not None:
+            du.configure_upload(self.app, str(self.uploads_dir))
+        
+        try:
+            from flask_compress import Compress
+            server.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+            Compress(server)
+        except ImportError:
+            logger.info("flask-compress not installed - responses will not be compressed")
+        
+        @server.route('/sw.js')
+        def service_worker():
+            # Served from the root so the worker's scope covers the whole dashboard
+            response = flask.send_from_directory(self.app.config.assets_folder, 'sw.js',
+                                                 mimetype='application/javascript')
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+        
+        @server.after_request
+        def cache_component_suites(response):
+            # Component bundle and asset URLs are fingerprinted, so they never go stale
+            path = flask_request.path
+            if path.startswith('/_dash-component-suites/') or path.startswith('/assets/'):
+                response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+            return response
+    
+    def _load_stats(self):
+        """Load clipstats.csv as a DataFrame, via a Parquet copy and an in-memory cache"""
+        import pandas as pd
+        
+        try:
+            csv_stat = self.stats_file.stat()
+        except FileNotFoundError:
+            return None
+        
+        key = (csv_stat.st_mtime_ns, csv_stat.st_size)
+        cached = getattr(self, '_stats_df', None)
+        if cached and cached[0] == key:
+            return cached[1]
+        
+        parquet_file = self.stats_file.with_suffix('.parquet')
+        df = None
+        try:
+            if parquet_file.stat().st_mtime_ns >= csv_stat.st_mtime_ns:
+                df = pd.read_parquet(parquet_file)
+        except (OSError, ImportError, ValueError):
+            df = None
+        
+        if df is None:
+            try:
+                df = pd.read_csv(self.stats_file, engine='pyarrow', dtype=_STATS_DTYPES)
+            except (ImportError, ValueError):
+                # pyarrow missing or column types not as declared
+                df = pd.read_csv(self.stats_file)
+            try:
+                df.to_parquet(parquet_file, compression='zstd')
+            except (OSError, ImportError, ValueError) as e:
+                logger.debug(f"Stats parquet not written: {e}")
+        
+        self._stats_df = (key, df)
+        return df
+    
+    def get_analytics_data(self) -> dict:
+        """Chart columns from clipstats.csv, reused until the file changes"""
+        df = self._load_stats()
+        if df is None:
+            return {}
+        
+        key = self._stats_df[0]
+        cached = getattr(self, '_analytics_data', None)
+        if cached and cached[0] == key:
+            return cached[1]
+        
+        columns = [c for c in ("timestamp", "title", "views", "est_gbp") if c in df.columns]
+        data = df[columns].fillna(0).to_dict("list")
+        self._analytics_data = (key, data)
+        return data
+    
+    @staticmethod
+    def _open_folder(path: str):
+        """Open a file or folder with the platform's default handler"""
+        try:
+            _open_path(path)
+        except Exception as e:
+            logger.error(f"Failed to open {path}: {e}")
+    
+    def collect_status_items(self) -> list:
+        """Gather the lines shown in the System Status card"""
+        # Check system status
+        status_items = []
+        
+        # Check Python
+        python_version = _PY_VERSION
+        status_items.append(f"✅ Python: {python_version}")
+        
+        # Run the independent probes concurrently
+        pool = self._probe_pool
+        env_future = pool.submit(self._cached, 'env_keys', 10,
+                                 self.api_wizard.check_environment_variables) if self.api_wizard else None
+        tree_future = pool.submit(self._tree_size_cached)
+        free_future = pool.submit(shutil.disk_usage, self.base_path)
+        
+        # Check tools (PATH/tools lookup only; no version subprocess)
+        if self.self_heal:
+            ffmpeg_available = self.self_heal.is_tool_installed('ffmpeg')
+            ytdlp_available = self.self_heal.is_tool_installed('yt-dlp')
+        
+            status_items.append(f"{'✅' if ffmpeg_available else '❌'} FFmpeg")
+            status_items.append(f"{'✅' if ytdlp_available else '❌'} yt-dlp")
+        
+        # Check API keys
+        env_keys = env_future.result(timeout=5) if env_future else {}
+        if env_keys:
+            status_items.append(f"✅ API Keys: {len(env_keys)} found")
+        else:
+            status_items.append("❌ API Keys: None found")
+        
+        # Check disk space
+        disk_gb = tree_future.result(timeout=30) / (1024**3)
+        free_gb = free_future.result(timeout=5).free / (1024**3)
+        status_items.append(f"💾 Disk Usage: {disk_gb:.1f} GB ({free_gb:.1f} GB free)")
+        
+        return status_items
+    
+    def _cached(self, key: str, ttl: float, fn):
+        """Return fn() memoized under key for ttl seconds"""
+        now = time.monotonic()
+        cached = self._status_cache.get(key)
+        if cached and now - cached[0] < ttl:
+            return cached[1]
+        value = fn()
+        self._status_cache[key] = (now, value)
+        return value
+    
+    def _tree_size_cached(self, ttl: float = 30) -> int:
+        """Total size in bytes of files under base_path, cached for ttl seconds"""
+        now = time.monotonic()
+        cached = getattr(self, '_tree_size', None)
+        if cached and now - cached[0] < ttl:
+            return cached[1]
+        
+        total = 0
+        for entry in _iter_files(str(self.base_path)):
+            try:
+                total += entry.stat(follow_symlinks=False).st_size
+            except OSError:
+                continue
+        
+        self._tree_size = (now, total)
+        return total
+    
     def setup_layout(self):
         """Setup the dashboard layout"""
         self.app.layout = dbc.Container([
@@ -123,7 +777,8 @@ class TrendClipDashboard:
                 ])
             ]),
             
-            # Navigation Tabs
+            # Navigation Tabs (only Overview is rendered up front; the other
+            # tabs are filled in by load_tab_content on first activation)
             dbc.Tabs([
                 # Overview Tab
                 dbc.Tab([
@@ -131,35 +786,24 @@ class TrendClipDashboard:
                 ], label="Overview", tab_id="overview"),
                 
                 # API Setup Tab
-                dbc.Tab([
-                    self.create_api_setup_tab()
-                ], label="API & Auth", tab_id="api-setup"),
+                dbc.Tab(html.Div(id="api-setup-content"), label="API & Auth", tab_id="api-setup"),
                 
                 # YouTube Upload Tab
-                dbc.Tab([
-                    self.create_upload_tab()
-                ], label="YouTube Upload", tab_id="upload"),
+                dbc.Tab(html.Div(id="upload-content"), label="YouTube Upload", tab_id="upload"),
                 
                 # Trending Tab
-                dbc.Tab([
-                    self.create_trending_tab()
-                ], label="Trending", tab_id="trending"),
+                dbc.Tab(html.Div(id="trending-content"), label="Trending", tab_id="trending"),
                 
                 # Analytics Tab
-                dbc.Tab([
-                    self.create_analytics_tab()
-                ], label="Analytics", tab_id="analytics"),
+                dbc.Tab(html.Div(id="analytics-content"), label="Analytics", tab_id="analytics"),
                 
                 # Tools Tab
-                dbc.Tab([
-                    self.create_tools_tab()
-                ], label="Tools", tab_id="tools"),
+                dbc.Tab(html.Div(id="tools-content"), label="Tools", tab_id="tools"),
                 
                 # Autopilot Tab
-                dbc.Tab([
-                    self.create_autopilot_tab()
-                ], label="Autopilot", tab_id="autopilot")
+                dbc.Tab(html.Div(id="autopilot-content"), label="Autopilot", tab_id="autopilot")
             ], id="tabs", active_tab="overview"),
+            dcc.Store(id="loaded-tabs", data=[]),
             
             # Status Bar
             dbc.Row([
@@ -171,249 +815,63 @@ class TrendClipDashboard:
     
     def create_overview_tab(self):
         """Create the overview tab content"""
-        return dbc.Row([
-            # System Status
-            dbc.Col([
-                dbc.Card([
-                    dbc.CardHeader("System Status"),
-                    dbc.CardBody([
-                        html.Div(id="system-status"),
-                        dbc.Button("Refresh Status", id="refresh-status", color="primary", className="mt-2")
-                    ])
-                ])
-            ], width=6),
-            
-            # Quick Actions
-            dbc.Col([
-                dbc.Card([
-                    dbc.CardHeader("Quick Actions"),
-                    dbc.CardBody([
-                        dbc.Button("Run API Wizard", id="run-api-wizard", color="success", className="me-2 mb-2"),
-                        dbc.Button("Self-Heal Tools", id="self-heal", color="warning", className="me-2 mb-2"),
-                        dbc.Button("Create Package", id="create-package", color="info", className="me-2 mb-2"),
-                        dbc.Button("Open Folders", id="open-folders", color="secondary", className="mb-2"),
-                        html.Div(id="quick-actions-output", className="mt-3")
-                    ])
-                ])
-            ], width=6),
-            
-            # Demo Chart
-            dbc.Col([
-                dbc.Card([
-                    dbc.CardHeader("Demo Chart"),
-                    dbc.CardBody([
-                        dcc.Graph(id="demo-graph", figure=px.line(
-                            x=list(range(10)), 
-                            y=[i*i for i in range(10)], 
-                            title="Demo chart"
-                        ))
-                    ])
-                ])
-            ], width=12, className="mt-3")
-        ])
+        return _OVERVIEW_TAB
     
     def create_api_setup_tab(self):
         """Create the API setup tab content with inline paste/upload functionality"""
-        return dbc.Row([
-            dbc.Col([
-                dbc.Card([
-                    dbc.CardHeader("API & Auth"),
-                    dbc.CardBody([
-                        html.P("Create a Google OAuth client (Desktop) and place client_secret.json into .secrets. You can paste JSON or upload the file here."),
-                        html.Ul([
-                            html.Li(html.A("Google Cloud Console", href="https://console.cloud.google.com/", className="link", target="_blank")),
-                            html.Li(html.A("Create OAuth client (Desktop)", href="https://console.cloud.google.com/apis/credentials/oauthclient", className="link", target="_blank")),
-                            html.Li(html.A("Enable YouTube Data API v3", href="https://console.cloud.google.com/apis/library/youtube.googleapis.com", className="link", target="_blank")),
-                        ]),
-                        html.Label("Paste client_secret.json contents"),
-                        dcc.Textarea(id="client-json", value="", style={"width":"100%","height":"140px"}),
-                        html.Div(style={"marginTop":"8px"}),
-                        html.Label("Or select client_secret.json file"),
-                        dcc.Upload(id="upload-client-json", children=html.Div(["Drag & Drop or ", html.A("Select file")]), multiple=False),
-                        html.Div(style={"marginTop":"8px"}),
-                        html.Label("Or paste a file path to client_secret.json"),
-                        dcc.Input(id="client-path", type="text", value="", style={"width":"100%"}),
-                        html.Div(style={"marginTop":"10px"}, children=[
-                            dbc.Button("Save client_secret.json", id="btn-save-secret", color="success", className="me-2"),
-                            dbc.Button("Clear token.json", id="btn-clear-token", color="warning", className="me-2"),
-                            dbc.Button("Test YouTube Login", id="btn-test-auth", color="info", className="me-2"),
-                            dbc.Button("Open .secrets", id="btn-open-secrets", color="secondary")
-                        ]),
-                        html.Div(id="api-status", style={"whiteSpace":"pre-wrap","marginTop":"10px"}),
-                    ])
-                ])
-            ], width=12)
-        ])
+        return _API_SETUP_TAB
     
     def create_upload_tab(self):
         """Create the YouTube upload tab"""
-        return dbc.Row([
-            dbc.Col([
-                dbc.Card([
-                    dbc.CardHeader("YouTube Upload (Shorts)"),
-                    dbc.CardBody([
-                        dcc.Upload(id="upload-video", children=html.Div(["Drag & Drop or ", html.A("Select video")]), multiple=False),
-                        html.Br(), 
-                        html.Label("Title"), 
-                        dcc.Input(id="yt-title", type="text", value="My TrendClip", style={"width":"100%"}),
-                        html.Br(), 
-                        html.Label("Description"), 
-                        dcc.Textarea(id="yt-desc", value="", style={"width":"100%","height":"100px"}),
-                        html.Br(), 
-                        html.Label("Tags (comma separated)"), 
-                        dcc.Input(id="yt-tags", type="text", value="trendclip,shorts", style={"width":"100%"}),
-                        html.Br(), 
-                        html.Label("Privacy"), 
-                        dcc.Dropdown(id="yt-privacy", options=[
-                            {"label":v,"value":v} for v in ("private","unlisted","public")
-                        ], value="private"),
-                        html.Br(), 
-                        dbc.Button("Upload", id="btn-upload", color="primary"),
-                        html.Div(id="upload-status", style={"whiteSpace":"pre-wrap","marginTop":"10px"}),
-                    ])
-                ])
-            ], width=12)
-        ])
+        return _UPLOAD_TAB
     
     def create_trending_tab(self):
         """Create the trending tab content"""
-        return dbc.Row([
-            # Trending Controls
-            dbc.Col([
-                dbc.Card([
-                    dbc.CardHeader("Trending Controls"),
-                    dbc.CardBody([
-                        dbc.Row([
-                            dbc.Col([
-                                dbc.Label("Region"),
-                                dbc.Select(
-                                    id="trending-region",
-                                    options=[
-                                        {"label": "United Kingdom", "value": "GB"},
-                                        {"label": "United States", "value": "US"},
-                                        {"label": "Canada", "value": "CA"},
-                                        {"label": "Australia", "value": "AU"}
-                                    ],
-                                    value=self.config.get('region', 'GB')
-                                )
-                            ], width=4),
-                            dbc.Col([
-                                dbc.Label("Limit"),
-                                dbc.Input(
-                                    id="trending-limit",
-                                    type="number",
-                                    value=50,
-                                    min=10,
-                                    max=200
-                                )
-                            ], width=4),
-                            dbc.Col([
-                                dbc.Button("Fetch Trends", id="fetch-trends", color="primary", className="mt-4")
-                            ], width=4)
-                        ]),
-                        html.Div(id="trending-output", className="mt-3")
-                    ])
-                ])
-            ], width=12),
-            
-            # Trending Results
-            dbc.Col([
-                dbc.Card([
-                    dbc.CardHeader("Trending Videos"),
-                    dbc.CardBody([
-                        html.Div(id="trending-results")
-                    ])
-                ])
-            ], width=12, className="mt-3")
-        ])
+        return _build_trending_tab(self._region)
     
     def create_analytics_tab(self):
         """Create the analytics tab content"""
-        return dbc.Row([
-            # Analytics Overview
-            dbc.Col([
-                dbc.Card([
-                    dbc.CardHeader("Analytics Overview"),
-                    dbc.CardBody([
-                        html.Div(id="analytics-overview")
-                    ])
-                ])
-            ], width=12),
-            
-            # Charts
-            dbc.Col([
-                dbc.Card([
-                    dbc.CardHeader("Performance Charts"),
-                    dbc.CardBody([
-                        dcc.Graph(id="views-chart"),
-                        dcc.Graph(id="revenue-chart")
-                    ])
-                ])
-            ], width=12, className="mt-3")
-        ])
+        return _ANALYTICS_TAB
     
     def create_tools_tab(self):
         """Create the tools tab content"""
-        return dbc.Row([
-            # Self-Test
-            dbc.Col([
-                dbc.Card([
-                    dbc.CardHeader("Self-Test"),
-                    dbc.CardBody([
-                        dbc.Button("Run Self-Test", id="btn-selftest", color="primary", className="me-2"),
-                        dbc.Button("Open Logs Folder", id="btn-open-logs", color="secondary"),
-                        html.Div(id="selftest-output", style={"whiteSpace":"pre-wrap","marginTop":"10px"}),
-                        dcc.Graph(id="selftest-figure"),
-                    ])
-                ])
-            ], width=6),
-            
-            # Packager
-            dbc.Col([
-                dbc.Card([
-                    dbc.CardHeader("Packager"),
-                    dbc.CardBody([
-                        html.P("Create a distributable ZIP (no venv/tokens)."),
-                        dbc.Button("Create ZIP", id="btn-pack", color="info"),
-                        html.Div(id="pack-status", style={"whiteSpace":"pre-wrap","marginTop":"10px"}),
-                    ])
-                ])
-            ], width=6),
-            
-            # System Tools
-            dbc.Col([
-                dbc.Card([
-                    dbc.CardHeader("System Tools"),
-                    dbc.CardBody([
-                        dbc.Button("Check Tools", id="check-tools", color="info", className="me-2"),
-                        dbc.Button("Install Missing", id="install-missing", color="warning", className="me-2"),
-                        dbc.Button("Create Package", id="create-package-tools", color="secondary"),
-                        html.Div(id="system-tools-output", className="mt-3")
-                    ])
-                ])
-            ], width=12, className="mt-3")
-        ])
+        return _TOOLS_TAB
     
     def create_autopilot_tab(self):
         """Create the autopilot tab content"""
-        return dbc.Row([
-            dbc.Col([
-                dbc.Card([
-                    dbc.CardHeader("Autopilot"),
-                    dbc.CardBody([
-                        html.P("Edit urls.txt, then run one cycle. Outputs to /dist."),
-                        dbc.Button("Open urls.txt", id="btn-open-urls", color="primary", className="me-2"),
-                        dbc.Button("Open dist Folder", id="btn-open-dist", color="secondary", className="me-2"),
-                        dbc.Button("Run Once", id="btn-do1", color="success"),
-                        html.Div(id="do1-status", style={"whiteSpace":"pre-wrap","marginTop":"10px"}),
-                    ])
-                ])
-            ], width=12)
-        ])
+        return _AUTOPILOT_TAB
     
     def setup_callbacks(self):
         """Setup Dash callbacks"""
         
+        # Lazy tab loading
+        lazy_tabs = {
+            "api-setup": self.create_api_setup_tab,
+            "upload": self.create_upload_tab,
+            "trending": self.create_trending_tab,
+            "analytics": self.create_analytics_tab,
+            "tools": self.create_tools_tab,
+            "autopilot": self.create_autopilot_tab
+        }
+        tab_cache = {}
+        
+        @self.app.callback(
+            [Output(f"{tab_id}-content", "children") for tab_id in lazy_tabs],
+            Output("loaded-tabs", "data"),
+            Input("tabs", "active_tab"),
+            State("loaded-tabs", "data")
+        )
+        def load_tab_content(active_tab, loaded):
+            loaded = loaded or []
+            # Render each tab once per page load so user input is kept
+            if active_tab not in lazy_tabs or active_tab in loaded:
+                raise PreventUpdate
+            if active_tab not in tab_cache:
+                tab_cache[active_tab] = lazy_tabs[active_tab]()
+            contents = [tab_cache[tab_id] if tab_id == active_tab else dash.no_update
+                        for tab_id in lazy_tabs]
+            return contents + [loaded + [active_tab]]
+        
         @self.app.callback(
             Output("system-status", "children"),
             Input("refresh-status", "n_clicks")
@@ -423,33 +881,8 @@ class TrendClipDashboard:
                 n_clicks = 0
             
             try:
-                # Check system status
-                status_items = []
-                
-                # Check Python
-                python_version = sys.version.split()[0]
-                status_items.append(f"✅ Python: {python_version}")
-                
-                # Check tools
-                if self.self_heal:
-                    ffmpeg_available, _ = self.self_heal.check_tool_availability('ffmpeg')
-                    ytdlp_available, _ = self.self_heal.check_tool_availability('yt-dlp')
-                    
-                    status_items.append(f"{'✅' if ffmpeg_available else '❌'} FFmpeg")
-                    status_items.append(f"{'✅' if ytdlp_available else '❌'} yt-dlp")
-                
-                # Check API keys
-                env_keys = self.api_wizard.check_environment_variables() if self.api_wizard else {}
-                if env_keys:
-                    status_items.append(f"✅ API Keys: {len(env_keys)} found")
-                else:
-                    status_items.append("❌ API Keys: None found")
-                
-                # Check disk space
-                disk_usage = self.base_path.stat().st_size
-                disk_gb = disk_usage / (1024**3)
-                status_items.append(f"💾 Disk Usage: {disk_gb:.1f} GB")
-                
+                # Rapid repeat clicks reuse the last result
+                status_items = self._cached('status_items', 2, self.collect_status_items)
                 return [html.P(item) for item in status_items]
                 
             except Exception as e:
@@ -463,25 +896,27 @@ class TrendClipDashboard:
         )
         def open_secrets(n):
             try:
-                if os.name == "nt":
-                    os.startfile(str(self.secrets_dir))
-                else:
-                    import subprocess
-                    subprocess.Popen(["open" if sys.platform=="darwin" else "xdg-open", str(self.secrets_dir)])
+                _open_path(str(self.secrets_dir))
                 return f"Opened: {self.secrets_dir}"
             except Exception as e:
                 return f"Open failed: {e}"
         
+        def _save_client_json(data, filename: str = None) -> str:
+            # Validate only; the user's bytes are written as-is rather than
+            # re-serialized
+            try:
+                _json_loads(data)
+            except Exception as e:
+                return f"{'Upload parse failed' if filename else 'Invalid JSON'}: {e}"
+            out = self.client_secret_file
+            out.write_bytes(data.encode("utf-8") if isinstance(data, str) else data)
+            source = f" from {filename}" if filename else ""
+            return f"✅ Saved client_secret.json{source} → {out}"
+
         def _save_client_json_from_text(text: str) -> str:
             if not text.strip():
                 return "Paste JSON or upload a file."
-            try:
-                obj = json.loads(text)
-            except Exception as e:
-                return f"Invalid JSON: {e}"
-            out = self.secrets_dir / "client_secret.json"
-            out.write_text(json.dumps(obj, indent=2), encoding="utf-8")
-            return f"✅ Saved client_secret.json → {out}"
+            return _save_client_json(text)
 
         def _save_client_json_from_upload(contents: str, filename: str) -> str:
             if not contents: 
@@ -489,12 +924,9 @@ class TrendClipDashboard:
             try:
                 header, data = contents.split(",", 1)
                 raw = base64.b64decode(data)
-                obj = json.loads(raw.decode("utf-8"))
             except Exception as e:
                 return f"Upload parse failed: {e}"
-            out = self.secrets_dir / "client_secret.json"
-            out.write_text(json.dumps(obj, indent=2), encoding="utf-8")
-            return f"✅ Saved client_secret.json from {filename} → {out}"
+            return _save_client_json(raw, filename)
 
         @self.app.callback(
             Output("api-status", "children", allow_duplicate=True),
@@ -515,11 +947,11 @@ class TrendClipDashboard:
                     p = pathlib.Path(path_value.strip('"'))
                     if not p.exists():
                         return f"Path not found: {p}"
+                    raw = p.read_bytes()
                     try:
-                        text = p.read_text(encoding="utf-8")
-                    except Exception:
-                        # try binary decode
-                        text = p.read_bytes().decode("utf-8", errors="ignore")
+                        text = raw.decode("utf-8")
+                    except UnicodeDecodeError:
+                        text = raw.decode("utf-8", errors="ignore")
                     return _save_client_json_from_text(text)
                 return "Provide JSON (paste, upload, or path)."
             except Exception as e:
@@ -532,9 +964,7 @@ class TrendClipDashboard:
         )
         def clear_token(n):
             try:
-                tok = self.secrets_dir / "token.json"
-                if tok.exists(): 
-                    tok.unlink()
+                self.token_file.unlink(missing_ok=True)
                 return "🔄 token.json cleared."
             except Exception as e:
                 return f"Clear failed: {e}"
@@ -554,31 +984,44 @@ class TrendClipDashboard:
         
         # Upload callbacks
         def _save_uploaded(contents: str, filename: str) -> Path:
-            header, data = contents.split(",", 1)
-            binary = base64.b64decode(data)
-            out_dir = self.dist_dir / "uploads"
-            out_dir.mkdir(parents=True, exist_ok=True)
-            out_path = out_dir / filename
-            with open(out_path, "wb") as f: 
-                f.write(binary)
+            # Skip the data URL header by offset rather than split(), which
+            # would copy the whole base64 payload
+            start = contents.index(",") + 1
+            self.uploads_dir.mkdir(parents=True, exist_ok=True)
+            out_path = self.uploads_dir / filename
+            # Decode in 4-byte-aligned slices so the whole video is never held decoded
+            with open(out_path, "wb", buffering=1 << 20) as f: 
+                for i in range(start, len(contents), _B64_CHUNK):
+                    f.write(base64.b64decode(contents[i:i + _B64_CHUNK]))
             return out_path
 
         @self.app.callback(
             Output("upload-status", "children"), 
             Input("btn-upload", "n_clicks"),
-            State("upload-video", "contents"), 
-            State("upload-video", "filename"),
+            *(
+                [State("upload-video", "fileNames"), State("upload-video", "upload_id")] if du is not None
+                else [State("upload-video", "contents"), State("upload-video", "filename")]
+            ),
             State("yt-title", "value"), 
             State("yt-desc", "value"), 
             State("yt-tags", "value"),
             State("yt-privacy", "value"), 
             prevent_initial_call=True
         )
-        def handle_upload(n, contents, filename, title, desc, tags_csv, privacy):
+        def handle_upload(n, upload_a, upload_b, title, desc, tags_csv, privacy):
             try:
-                if not contents or not filename: 
-                    return "Please select a video file first."
-                saved = _save_uploaded(contents, filename)
+                if du is not None:
+                    # dash-uploader has already written the file to disk
+                    file_names, upload_id = upload_a, upload_b
+                    if not file_names: 
+                        return "Please select a video file first."
+                    filename = file_names[0]
+                    saved = self.uploads_dir / (upload_id or "") / filename
+                else:
+                    contents, filename = upload_a, upload_b
+                    if not contents or not filename: 
+                        return "Please select a video file first."
+                    saved = _save_uploaded(contents, filename)
                 tags = [t.strip() for t in (tags_csv or "").split(",") if t.strip()]
                 from youtube_uploader import upload_video
                 resp = upload_video(
@@ -602,23 +1045,44 @@ class TrendClipDashboard:
         def create_zip(n):
             try:
                 import zipfile
-                ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+                try:
+                    # File types stored uncompressed (already compressed)
+                    from packager import STORED_SUFFIXES
+                except ImportError:
+                    STORED_SUFFIXES = frozenset()
+                ts = time.strftime("%Y%m%d_%H%M%S")
                 zip_path = self.dist_dir / f"TrendClipOne_{ts}.zip"
                 include = [
                     "TrendClipDashboard_Standalone.py","wizard.py","video_helpers.py",
-                    "youtube_uploader.py","autopilot.py","jobs.py","requirements.txt",
+                    "youtube_uploader.py","autopilot.py","jobs.py","config_cache.py","requirements.txt",
                     "config.yaml","assets/","data/"
                 ]
-                with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as z:
-                    for item in include:
-                        p = self.base_path / item
-                        if p.is_dir():
-                            for root, _, files in os.walk(p):
-                                for f in files:
-                                    fp = pathlib.Path(root) / f
-                                    z.write(fp, fp.relative_to(self.base_path))
-                        elif p.exists(): 
-                            z.write(p, p.relative_to(self.base_path))
+                # Collect (path, arcname) pairs before opening the archive
+                entries = []
+                for item in include:
+                    p = self.base_path / item
+                    if p.is_dir():
+                        for entry in _iter_files(str(p)):
+                            entries.append((entry.path, os.path.relpath(entry.path, self.base_path)))
+                    elif p.exists(): 
+                        entries.append((str(p), item))
+                
+                with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1) as z:
+                    for fp, arcname in entries:
+                        # Deflating already-compressed media wastes CPU for no gain
+                        if os.path.splitext(fp)[1].lower() in STORED_SUFFIXES:
+                            compress_type = zipfile.ZIP_STORED
+                        else:
+                            compress_type = zipfile.ZIP_DEFLATED
+                        
+                        info = zipfile.ZipInfo.from_file(fp, arcname)
+                        if info.file_size <= _ZIP_INLINE_MAX:
+                            # Small files: one read, no second stat/open inside write()
+                            with open(fp, "rb") as f:
+                                data = f.read()
+                            z.writestr(info, data, compress_type=compress_type, compresslevel=1)
+                        else:
+                            z.write(fp, arcname, compress_type=compress_type)
                 try:
                     import shutil
                     desktop = pathlib.Path.home() / "Desktop"
@@ -629,6 +1093,27 @@ class TrendClipDashboard:
             except Exception as e:
                 return f"Failed to pack: {e}"
         
+        # Analytics callbacks
+        @self.app.callback(
+            Output("analytics-data", "data"),
+            Input("tabs", "active_tab")
+        )
+        def load_analytics_data(active_tab):
+            if active_tab != "analytics":
+                raise PreventUpdate
+            try:
+                return self.get_analytics_data()
+            except Exception as e:
+                logger.error(f"Failed to load analytics data: {e}")
+                return {}
+        
+        self.app.clientside_callback(
+            ClientsideFunction(namespace="analytics", function_name="updateCharts"),
+            Output("views-chart", "figure"),
+            Output("revenue-chart", "figure"),
+            Input("analytics-data", "data")
+        )
+        
         # Self-test callback
         @self.app.callback(
             Output("selftest-output", "children"), 
@@ -637,42 +1122,87 @@ class TrendClipDashboard:
             prevent_initial_call=True
         )
         def run_selftest(n):
+            # Patch only the trace data and title of the pre-built figure
+            fig = Patch()
             try:
-                (self.logs_dir / "selftest.txt").write_text(
-                    f"Self-test at {datetime.now().isoformat()}\n", 
+                self.selftest_file.write_text(
+                    f"Self-test at {time.strftime('%Y-%m-%dT%H:%M:%S')}\n", 
                     encoding="utf-8"
                 )
-                fig = px.scatter(
-                    x=list(range(30)), 
-                    y=[i * 0.5 for i in range(30)], 
-                    title="Self-test scatter"
-                )
+                fig["data"][0]["x"] = list(range(30))
+                fig["data"][0]["y"] = [i * 0.5 for i in range(30)]
+                fig["layout"]["title"]["text"] = "Self-test scatter"
                 return "✅ Self-test passed", fig
             except Exception as e:
-                fig = px.scatter(x=[0], y=[0], title="Self-test error")
+                fig["data"][0]["x"] = [0]
+                fig["data"][0]["y"] = [0]
+                fig["layout"]["title"]["text"] = "Self-test error"
                 return f"❌ Self-test failed: {e}", fig
         
         # Autopilot callbacks
-        @self.app.callback(
-            Output("do1-status", "children"), 
-            Input("btn-do1", "n_clicks"), 
-            prevent_initial_call=True
-        )
-        def do1(n):
+        # Only plain values are captured so the job can run in a worker process
+        autopilot_script = str(self.autopilot_script)
+        autopilot_log = str(self.autopilot_log)
+        base_dir = str(self.base_path)
+        
+        def run_autopilot(set_progress=None, in_process=False):
             try:
-                import subprocess
-                py_exe = os.environ.get("TRENDCLIP_VENV_PY", sys.executable)
-                p = subprocess.run(
-                    [py_exe, str(self.base_path / "autopilot.py")], 
-                    capture_output=True, 
-                    text=True, 
-                    cwd=str(self.base_path)
-                )
-                log = self.logs_dir / "autopilot.log"
-                tail = (log.read_text(encoding="utf-8") if log.exists() else "")[-2000:]
-                return f"Return: {p.returncode}\n--- autopilot.log (tail) ---\n{tail}"
+                recent = deque(maxlen=20)
+                
+                def report(line):
+                    recent.append(line.rstrip())
+                    if set_progress:
+                        set_progress("\n".join(recent))
+                
+                # Inside a background worker process, call autopilot.main()
+                # directly instead of starting a second interpreter
+                autopilot_main = None
+                if in_process and not os.environ.get("TRENDCLIP_VENV_PY"):
+                    # base_dir stays importable while main() runs (lazy imports),
+                    # and is taken off sys.path afterwards
+                    with _on_sys_path(base_dir):
+                        autopilot_main = _load_autopilot_main(autopilot_script)
+                        if autopilot_main:
+                            with _in_directory(base_dir):
+                                returncode = _run_autopilot_main(autopilot_main, report)
+                
+                if not autopilot_main:
+                    py_exe = os.environ.get("TRENDCLIP_VENV_PY", sys.executable)
+                    with subprocess.Popen(
+                        [py_exe, autopilot_script], 
+                        stdout=subprocess.PIPE, 
+                        stderr=subprocess.STDOUT, 
+                        text=True, 
+                        cwd=base_dir
+                    ) as p:
+                        for line in p.stdout:
+                            report(line)
+                        returncode = p.wait()
+                
+                tail = _tail_text(autopilot_log, 2000)
+                return f"Return: {returncode}\n--- autopilot.log (tail) ---\n{tail}"
             except Exception as e:
                 return f"Do1 failed: {e}"
+        
+        if self.background_manager:
+            @self.app.callback(
+                Output("do1-status", "children"), 
+                Input("btn-do1", "n_clicks"), 
+                background=True,
+                progress=Output("do1-progress", "children"),
+                running=[(Output("btn-do1", "disabled"), True, False)],
+                prevent_initial_call=True
+            )
+            def do1(set_progress, n):
+                return run_autopilot(set_progress, in_process=True)
+        else:
+            @self.app.callback(
+                Output("do1-status", "children"), 
+                Input("btn-do1", "n_clicks"), 
+                prevent_initial_call=True
+            )
+            def do1(n):
+                return run_autopilot()
 
         @self.app.callback(
             Output("do1-status", "children", allow_duplicate=True), 
@@ -680,15 +1210,11 @@ class TrendClipDashboard:
             prevent_initial_call=True
         )
         def open_urls(n):
-            u = self.base_path / "urls.txt"
+            u = self.urls_file
             if not u.exists(): 
                 u.write_text("# Put one URL per line (YouTube/TikTok/etc.)\n", encoding="utf-8")
             try:
-                if os.name == "nt":
-                    os.startfile(str(u))
-                else:
-                    import subprocess
-                    subprocess.Popen(["open" if sys.platform=="darwin" else "xdg-open", str(u)])
+                _open_path(str(u))
                 return f"Opened: {u}"
             except Exception as e:
                 return f"Open failed: {e}"
@@ -700,61 +1226,113 @@ class TrendClipDashboard:
         )
         def open_dist(n):
             try:
-                if os.name == "nt":
-                    os.startfile(str(self.dist_dir))
-                else:
-                    import subprocess
-                    subprocess.Popen(["open" if sys.platform=="darwin" else "xdg-open", str(self.dist_dir)])
+                _open_path(str(self.dist_dir))
                 return f"Opened: {self.dist_dir}"
             except Exception as e:
                 return f"Open failed: {e}"
         
-        # Other existing callbacks...
+        # Quick action callbacks
+        def _run_api_wizard():
+            if not self.api_wizard:
+                return ""
+            # Never block the server on console prompts; keep the current settings
+            answers = self.api_wizard.load_answers() or dict(self.config)
+            success = self.api_wizard.run_wizard(answers)
+            return f"{'✅' if success else '❌'} API Wizard {'completed' if success else 'failed'}"
+        
+        def _self_heal():
+            if not self.self_heal:
+                return ""
+            results = self.self_heal.heal_all_tools()
+            success_count = sum(1 for success in results.values() if success)
+            return f"✅ Self-heal completed: {success_count}/{len(results)} tools ready"
+        
+        def _create_package():
+            if self.packager is None:
+                from packager import create_packager
+                self.packager = create_packager(str(self.base_path))
+            package_path = self.packager.create_package()
+            return f"✅ Package created: {Path(package_path).name}"
+        
+        def _open_base_folder():
+            threading.Thread(target=self._open_folder, args=(str(self.base_path),), daemon=True).start()
+            return "✅ Opened TrendClip folder"
+        
+        quick_actions = {
+            "api-wizard": _run_api_wizard,
+            "self-heal": _self_heal,
+            "create-package": _create_package,
+            "open-folders": _open_base_folder
+        }
+        
+        # Actions that can block for a while are submitted to the job pool
+        background_actions = {"api-wizard", "self-heal", "create-package"}
+        
         @self.app.callback(
             Output("quick-actions-output", "children"),
-            Input("run-api-wizard", "n_clicks"),
-            Input("self-heal", "n_clicks"),
-            Input("create-package", "n_clicks"),
-            Input("open-folders", "n_clicks")
+            Output("quick-actions-poll", "disabled"),
+            Input({"type": "quick-action", "action": ALL}, "n_clicks"),
+            prevent_initial_call=True
         )
-        def handle_quick_actions(wizard_clicks, heal_clicks, package_clicks, folders_clicks):
-            ctx = callback_context
-            if not ctx.triggered:
-                return ""
+        def handle_quick_actions(_clicks):
+            triggered = callback_context.triggered_id
+            if not triggered:
+                raise PreventUpdate
+            
+            name = triggered["action"]
+            action = quick_actions.get(name)
+            if action is None:
+                return "", dash.no_update
             
-            button_id = ctx.triggered[0]['prop_id'].split('.')[0]
+            if name in background_actions:
+                job = self._jobs.get(name)
+                if job is not None and not job.done():
+                    return f"⏳ {name} is already running...", False
+                self._jobs[name] = self._job_pool.submit(action)
+                return f"⏳ Running {name}...", False
             
             try:
-                if button_id == "run-api-wizard" and self.api_wizard:
-                    success = self.api_wizard.run_wizard()
-                    return f"{'✅' if success else '❌'} API Wizard {'completed' if success else 'failed'}"
-                
-                elif button_id == "self-heal" and self.self_heal:
-                    results = self.self_heal.heal_all_tools()
-                    success_count = sum(1 for success in results.values() if success)
-                    return f"✅ Self-heal completed: {success_count}/{len(results)} tools ready"
-                
-                elif button_id == "create-package" and self.packager:
-                    package_path = self.packager.create_package()
-                    return f"✅ Package created: {Path(package_path).name}"
-                
-                elif button_id == "open-folders":
-                    import subprocess
-                    subprocess.Popen(['explorer', str(self.base_path)])
-                    return "✅ Opened TrendClip folder"
-                
-                return ""
-                
+                return action(), dash.no_update
             except Exception as e:
-                return f"❌ Action failed: {e}"
+                return f"❌ Action failed: {e}", dash.no_update
+        
+        @self.app.callback(
+            Output("quick-actions-output", "children", allow_duplicate=True),
+            Output("quick-actions-poll", "disabled", allow_duplicate=True),
+            Input("quick-actions-poll", "n_intervals"),
+            prevent_initial_call=True
+        )
+        def poll_quick_actions(_n):
+            finished = [name for name, job in self._jobs.items() if job.done()]
+            running = len(self._jobs) > len(finished)
+            if not finished:
+                if running:
+                    raise PreventUpdate
+                return dash.no_update, True
+            
+            messages = []
+            for name in finished:
+                job = self._jobs.pop(name)
+                try:
+                    messages.append(job.result())
+                except Exception as e:
+                    messages.append(f"❌ Action failed: {e}")
+            return html.Div([html.Div(m) for m in messages if m]), not running
     
     def run(self, debug=False):
         """Run the dashboard"""
-        port = int(os.environ.get('TRENDCLIP_PORT', 8700))
-        host = os.environ.get('TRENDCLIP_BIND', '127.0.0.1')
+        host, port = _resolved_endpoint()
         
         logger.info(f"Starting TrendClip Dashboard on http://{host}:{port}")
         
+        if not debug:
+            try:
+                from waitress import serve
+                serve(self.app.server, host=host, port=port, threads=8, channel_timeout=120)
+                return
+            except ImportError:
+                logger.warning("waitress not installed - falling back to the development server")
+        
         self.app.run_server(
             debug=debug,
             host=host,
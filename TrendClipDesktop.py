@@ -6,29 +6,41 @@ Wraps the dashboard in a native window using pywebview
 
 import os
 import sys
+import socket
 import threading
 import time
 import logging
 from pathlib import Path
 
+# Setup logging before the dashboard import so this level wins
+logging.basicConfig(level=os.environ.get('TRENDCLIP_LOG_LEVEL', 'WARNING').upper())
+logger = logging.getLogger(__name__)
+
 try:
     import webview
 except ImportError:
+    if os.environ.get("TRENDCLIP_AUTO_INSTALL") != "1":
+        raise ImportError("pywebview not installed. Run: pip install pywebview "
+                          "(or set TRENDCLIP_AUTO_INSTALL=1 to install it on launch)")
     print("pywebview not installed. Installing...")
     import subprocess
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "pywebview"])
+    subprocess.run([sys.executable, "-m", "pip", "install", "pywebview"], close_fds=False, check=True)
     import webview
 
 # Import our dashboard
 try:
-    from TrendClipDashboard_Standalone import TrendClipDashboard
+    from TrendClipDashboard_Standalone import TrendClipDashboard, _resolved_endpoint
 except ImportError:
     print("Dashboard module not found. Running in basic mode.")
     TrendClipDashboard = None
 
-# Setup logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+    def _resolved_endpoint():
+        return os.environ.get('TRENDCLIP_BIND', '127.0.0.1'), int(os.environ.get('TRENDCLIP_PORT', 8700))
+
+# Shown while the dashboard server is still starting
+LOADING_HTML = """<!doctype html><meta charset="utf-8">
+<style>body{background:#0b0f17;color:#e8eef9;font-family:Arial,sans-serif}</style>
+<h2 style="text-align:center;margin-top:40vh">🎯 Starting TrendClip…</h2>"""
 
 class TrendClipDesktop:
     """Desktop application wrapper"""
@@ -38,6 +50,8 @@ class TrendClipDesktop:
         self.dashboard = None
         self.webview_window = None
         self.dashboard_thread = None
+        self.host, self.port = _resolved_endpoint()
+        self.url = f"http://{self.host}:{self.port}"
         
     def start_dashboard(self):
         """Start the dashboard in a separate thread"""
@@ -49,7 +63,7 @@ class TrendClipDesktop:
                 # Fallback to basic dashboard
                 self.run_basic_dashboard()
         except Exception as e:
-            logger.error(f"Dashboard failed to start: {e}")
+            logger.error("Dashboard failed to start: %s", e)
             self.run_basic_dashboard()
     
     def run_basic_dashboard(self):
@@ -110,29 +124,36 @@ class TrendClipDesktop:
             </html>
             ''')
         
-        port = int(os.environ.get('TRENDCLIP_PORT', 8700))
-        host = os.environ.get('TRENDCLIP_BIND', '127.0.0.1')
-        
-        app.run(host=host, port=port, debug=False, use_reloader=False)
+        app.run(host=self.host, port=self.port, debug=False, use_reloader=False)
+    
+    def wait_for_dashboard(self, timeout=10.0):
+        """Poll the dashboard port until it accepts connections or the timeout expires"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                with socket.create_connection((self.host, self.port), timeout=0.1):
+                    return True
+            except OSError:
+                time.sleep(0.05)
+        logger.warning("Dashboard not reachable at %s after %.0fs", self.url, timeout)
+        return False
+    
+    def show_dashboard(self):
+        """Point the window at the dashboard once the server is listening"""
+        self.wait_for_dashboard()
+        self.webview_window.load_url(self.url)
     
     def create_window(self):
         """Create the native window"""
         try:
-            port = int(os.environ.get('TRENDCLIP_PORT', 8700))
-            host = os.environ.get('TRENDCLIP_BIND', '127.0.0.1')
-            url = f"http://{host}:{port}"
-            
             # Start dashboard in background thread
             self.dashboard_thread = threading.Thread(target=self.start_dashboard, daemon=True)
             self.dashboard_thread.start()
             
-            # Wait for dashboard to start
-            time.sleep(3)
-            
-            # Create window
+            # Create window with a placeholder so WebView2 warms up while the dashboard binds
             self.webview_window = webview.create_window(
                 title="TrendClip Desktop",
-                url=url,
+                html=LOADING_HTML,
                 width=1200,
                 height=800,
                 resizable=True,
@@ -140,11 +161,17 @@ class TrendClipDesktop:
                 confirm_close=False
             )
             
-            logger.info(f"Starting TrendClip Desktop window at {url}")
-            webview.start(debug=False)
+            logger.info("Starting TrendClip Desktop window at %s", self.url)
+            # Keep a persistent WebView2 profile so relaunches reuse its HTTP cache
+            webview.start(
+                func=self.show_dashboard,
+                debug=False,
+                private_mode=False,
+                storage_path=str(self.base_path / ".webview_cache")
+            )
             
         except Exception as e:
-            logger.error(f"Failed to create window: {e}")
+            logger.error("Failed to create window: %s", e)
             print(f"❌ Failed to start TrendClip Desktop: {e}")
             print("Please check the console for error details.")
     
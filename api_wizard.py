@@ -10,69 +10,73 @@ import json
 import webbrowser
 import tempfile
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+import functools
+import importlib
+import importlib.util
 import logging
 
-try:
-    from google_auth_oauthlib.flow import InstalledAppFlow
-    from google.auth.transport.requests import Request
+if TYPE_CHECKING:
     from google.oauth2.credentials import Credentials
-    from googleapiclient.discovery import build
-    from googleapiclient.errors import HttpError
-except ImportError:
+
+# Google client libraries are imported on first use, not at module load
+_GOOGLE_PACKAGES = ("google-api-python-client", "google-auth",
+                    "google-auth-oauthlib", "google-auth-httplib2")
+_GOOGLE_MODULES = ("google_auth_oauthlib", "google.oauth2", "googleapiclient")
+
+@functools.lru_cache(maxsize=1)
+def _require_google_libs():
+    """Make sure the Google client libraries are importable, installing them only when opted in"""
+    if all(importlib.util.find_spec(name) for name in _GOOGLE_MODULES):
+        return
+    if os.environ.get("TRENDCLIP_AUTO_INSTALL") != "1":
+        raise ImportError("Google API libraries not installed. Run: pip install "
+                          f"{' '.join(_GOOGLE_PACKAGES)} "
+                          "(or set TRENDCLIP_AUTO_INSTALL=1 to install them on launch)")
     print("Google API libraries not installed. Installing...")
     import subprocess
-    subprocess.check_call([sys.executable, "-m", "pip", "install", 
-                          "google-api-python-client", "google-auth", 
-                          "google-auth-oauthlib", "google-auth-httplib2"])
-    from google_auth_oauthlib.flow import InstalledAppFlow
-    from google.auth.transport.requests import Request
-    from google.oauth2.credentials import Credentials
-    from googleapiclient.discovery import build
-    from googleapiclient.errors import HttpError
+    subprocess.run([sys.executable, "-m", "pip", "install", *_GOOGLE_PACKAGES],
+                   close_fds=False, check=True)
+    importlib.invalidate_caches()
+
+# OAuth scopes
+SCOPES = (
+    'https://www.googleapis.com/auth/youtube.upload',
+    'https://www.googleapis.com/auth/youtube.readonly'
+)
+
+# API keys picked up from the environment
+ENV_KEY_NAMES = ('YOUTUBE_API_KEY', 'OPENAI_API_KEY', 'TAVILY_API_KEY')
 
 class APIWizard:
     """Handles YouTube API setup and OAuth authentication"""
     
+    SCOPES = SCOPES
+    
     def __init__(self, base_path: str):
         self.base_path = Path(base_path)
         self.secrets_dir = self.base_path / ".secrets"
         self.secrets_dir.mkdir(exist_ok=True)
         self.logger = logging.getLogger(__name__)
         
-        # OAuth scopes
-        self.SCOPES = [
-            'https://www.googleapis.com/auth/youtube.upload',
-            'https://www.googleapis.com/auth/youtube.readonly'
-        ]
-        
         # File paths
         self.client_secret_file = self.secrets_dir / "client_secret.json"
         self.token_file = self.secrets_dir / "token.json"
         self.config_file = self.base_path / "config.yaml"
         
+        # (access token, client) from the last credentials test
+        self._youtube = None
+        
+        # Shared transport for token refreshes, created on first use
+        self._auth_request = None
+        
     def check_environment_variables(self) -> Dict[str, str]:
         """Check for API keys in environment variables"""
-        env_keys = {}
-        
-        # Check for YouTube API key
-        youtube_key = os.environ.get('YOUTUBE_API_KEY')
-        if youtube_key:
-            env_keys['YOUTUBE_API_KEY'] = youtube_key
-            self.logger.info("Found YOUTUBE_API_KEY in environment")
-            
-        # Check for OpenAI API key
-        openai_key = os.environ.get('OPENAI_API_KEY')
-        if openai_key:
-            env_keys['OPENAI_API_KEY'] = openai_key
-            self.logger.info("Found OPENAI_API_KEY in environment")
-            
-        # Check for Tavily API key
-        tavily_key = os.environ.get('TAVILY_API_KEY')
-        if tavily_key:
-            env_keys['TAVILY_API_KEY'] = tavily_key
-            self.logger.info("Found TAVILY_API_KEY in environment")
-            
+        # Read every time: keys exported after startup must show up (the dashboard
+        # rate-limits its own status checks)
+        env_keys = {name: os.environ[name] for name in ENV_KEY_NAMES if os.environ.get(name)}
+        for name in env_keys:
+            self.logger.info("Found %s in environment", name)
         return env_keys
     
     def create_client_secret_template(self) -> str:
@@ -116,13 +120,16 @@ class APIWizard:
                 print("Please edit this file with your actual credentials.")
                 return False
             
+            _require_google_libs()
+            from google_auth_oauthlib.flow import InstalledAppFlow
+            from google.oauth2.credentials import Credentials
+            
             # Load client secrets
             with open(self.client_secret_file, 'r') as f:
                 client_secrets = json.load(f)
             
-            # Create flow
-            flow = InstalledAppFlow.from_client_secrets_file(
-                str(self.client_secret_file), self.SCOPES)
+            # Create flow from the already-parsed secrets
+            flow = InstalledAppFlow.from_client_config(client_secrets, self.SCOPES)
             
             # Check if we have valid credentials
             creds = None
@@ -133,7 +140,7 @@ class APIWizard:
             # If no valid credentials, let user log in
             if not creds or not creds.valid:
                 if creds and creds.expired and creds.refresh_token:
-                    creds.refresh(Request())
+                    creds.refresh(self._get_auth_request())
                 else:
                     print("\n🔐 YouTube OAuth Authentication Required")
                     print("A browser window will open for you to sign in to Google.")
@@ -156,14 +163,36 @@ class APIWizard:
                 return False
                 
         except Exception as e:
-            self.logger.error(f"YouTube OAuth setup failed: {e}")
+            self.logger.error("YouTube OAuth setup failed: %s", e)
             print(f"❌ YouTube OAuth setup failed: {e}")
             return False
     
-    def test_youtube_credentials(self, creds: Credentials) -> bool:
+    def _get_auth_request(self):
+        """Return a google-auth Request backed by one pooled requests.Session"""
+        if self._auth_request is None:
+            import requests
+            from google.auth.transport.requests import Request
+            
+            self._auth_request = Request(session=requests.Session())
+        return self._auth_request
+    
+    def _youtube_client(self, creds: "Credentials"):
+        """Return a YouTube client for creds, reusing it while the token is unchanged"""
+        if self._youtube is None or self._youtube[0] != creds.token:
+            from googleapiclient.discovery import build
+            
+            # Bundled discovery document, no HTTP fetch
+            youtube = build('youtube', 'v3', credentials=creds,
+                            static_discovery=True, cache_discovery=False)
+            self._youtube = (creds.token, youtube)
+        return self._youtube[1]
+    
+    def test_youtube_credentials(self, creds: "Credentials") -> bool:
         """Test YouTube API credentials"""
+        from googleapiclient.errors import HttpError
+        
         try:
-            youtube = build('youtube', 'v3', credentials=creds)
+            youtube = self._youtube_client(creds)
             
             # Test with a simple API call
             request = youtube.channels().list(
@@ -175,7 +204,7 @@ class APIWizard:
             if 'items' in response:
                 channel = response['items'][0]
                 channel_name = channel['snippet']['title']
-                self.logger.info(f"YouTube API test successful. Channel: {channel_name}")
+                self.logger.info("YouTube API test successful. Channel: %s", channel_name)
                 print(f"✅ Connected to YouTube channel: {channel_name}")
                 return True
             else:
@@ -183,33 +212,54 @@ class APIWizard:
                 return False
                 
         except HttpError as e:
-            self.logger.error(f"YouTube API test failed: {e}")
+            self.logger.error("YouTube API test failed: %s", e)
             return False
         except Exception as e:
-            self.logger.error(f"YouTube API test failed: {e}")
+            self.logger.error("YouTube API test failed: %s", e)
             return False
     
-    def setup_api_keys(self) -> Dict[str, str]:
-        """Set up API keys via user input"""
+    def load_answers(self) -> Optional[Dict]:
+        """Load non-interactive wizard answers from the TRENDCLIP_WIZARD_ANSWERS JSON file"""
+        answers_file = os.environ.get('TRENDCLIP_WIZARD_ANSWERS')
+        if not answers_file:
+            return None
+        try:
+            with open(answers_file, 'rb') as f:
+                return json.load(f)
+        except Exception as e:
+            self.logger.error("Failed to read wizard answers from %s: %s", answers_file, e)
+            return None
+    
+    @staticmethod
+    def _ask(answers: Optional[Dict], key: str, prompt: str) -> str:
+        """Return the answer for key, or prompt for it when running interactively"""
+        if answers is not None:
+            value = answers.get(key)
+            return "" if value is None else str(value).strip()
+        return input(prompt).strip()
+    
+    def setup_api_keys(self, answers: Optional[Dict] = None) -> Dict[str, str]:
+        """Set up API keys via user input, or from answers when given"""
         api_keys = {}
         
         print("\n🔑 API Key Setup")
-        print("Enter your API keys (press Enter to skip):")
+        if answers is None:
+            print("Enter your API keys (press Enter to skip):")
         
         # YouTube API Key
-        youtube_key = input("\nYouTube API Key (optional, OAuth preferred): ").strip()
+        youtube_key = self._ask(answers, 'YOUTUBE_API_KEY', "\nYouTube API Key (optional, OAuth preferred): ")
         if youtube_key:
             api_keys['YOUTUBE_API_KEY'] = youtube_key
             print("✅ YouTube API key saved")
         
         # OpenAI API Key
-        openai_key = input("OpenAI API Key: ").strip()
+        openai_key = self._ask(answers, 'OPENAI_API_KEY', "OpenAI API Key: ")
         if openai_key:
             api_keys['OPENAI_API_KEY'] = openai_key
             print("✅ OpenAI API key saved")
         
         # Tavily API Key
-        tavily_key = input("Tavily API Key: ").strip()
+        tavily_key = self._ask(answers, 'TAVILY_API_KEY', "Tavily API Key: ")
         if tavily_key:
             api_keys['TAVILY_API_KEY'] = tavily_key
             print("✅ Tavily API key saved")
@@ -220,20 +270,19 @@ class APIWizard:
         """Save API keys to .env file"""
         try:
             env_file = self.base_path / ".env"
-            env_content = []
-            
-            for key, value in api_keys.items():
-                env_content.append(f"{key}={value}")
+            payload = "".join(f"{key}={value}\n" for key, value in api_keys.items())
             
-            with open(env_file, 'w') as f:
-                f.write('\n'.join(env_content))
+            # Write to a temp file and swap it in so a crash can't leave a partial .env
+            tmp_file = env_file.with_name(".env.tmp")
+            tmp_file.write_bytes(payload.encode("utf-8"))
+            os.replace(tmp_file, env_file)
             
-            self.logger.info(f"API keys saved to {env_file}")
+            self.logger.info("API keys saved to %s", env_file)
             print(f"✅ API keys saved to {env_file}")
             return True
             
         except Exception as e:
-            self.logger.error(f"Failed to save API keys: {e}")
+            self.logger.error("Failed to save API keys: %s", e)
             print(f"❌ Failed to save API keys: {e}")
             return False
     
@@ -242,30 +291,41 @@ class APIWizard:
         try:
             import yaml
             
+            # Prefer the libyaml C loader/dumper when PyYAML was built with it
+            loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+            dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+            
             # Load existing config
             config = {}
             if self.config_file.exists():
                 with open(self.config_file, 'r') as f:
-                    config = yaml.safe_load(f) or {}
+                    config = yaml.load(f, Loader=loader) or {}
             
             # Update with new settings
             config.update(settings)
             
             # Save updated config
             with open(self.config_file, 'w') as f:
-                yaml.dump(config, f, default_flow_style=False)
+                yaml.dump(config, f, Dumper=dumper, default_flow_style=False)
             
             self.logger.info("Configuration updated")
             print("✅ Configuration updated")
             return True
             
         except Exception as e:
-            self.logger.error(f"Failed to update config: {e}")
+            self.logger.error("Failed to update config: %s", e)
             print(f"❌ Failed to update config: {e}")
             return False
     
-    def run_wizard(self) -> bool:
-        """Run the complete API setup wizard"""
+    def run_wizard(self, answers: Optional[Dict] = None) -> bool:
+        """Run the complete API setup wizard
+        
+        Prompts interactively unless answers are passed in or provided through
+        TRENDCLIP_WIZARD_ANSWERS; keys are the .env names and config.yaml settings.
+        """
+        if answers is None:
+            answers = self.load_answers()
+        
         print("\n" + "="*60)
         print("🎯 TrendClip Desktop - API Setup Wizard")
         print("="*60)
@@ -285,7 +345,7 @@ class APIWizard:
         
         # API keys setup
         print("\n🔑 Additional API Keys Setup")
-        api_keys = self.setup_api_keys()
+        api_keys = self.setup_api_keys(answers)
         
         # Save API keys
         if api_keys:
@@ -296,19 +356,19 @@ class APIWizard:
         config_settings = {}
         
         # Region
-        region = input("Default region (e.g., GB, US): ").strip() or "GB"
+        region = self._ask(answers, 'region', "Default region (e.g., GB, US): ") or "GB"
         config_settings['region'] = region
         
         # CPM
         try:
-            cpm = float(input("Default CPM in GBP (e.g., 3.5): ").strip() or "3.5")
+            cpm = float(self._ask(answers, 'cpm_gbp', "Default CPM in GBP (e.g., 3.5): ") or "3.5")
             config_settings['cpm_gbp'] = cpm
         except ValueError:
             config_settings['cpm_gbp'] = 3.5
         
         # Clip duration
         try:
-            duration = int(input("Default clip duration in seconds (e.g., 60): ").strip() or "60")
+            duration = int(self._ask(answers, 'clip_duration', "Default clip duration in seconds (e.g., 60): ") or "60")
             config_settings['clip_duration'] = duration
         except ValueError:
             config_settings['clip_duration'] = 60
@@ -341,7 +401,7 @@ def main():
     
     # Setup logging
     logging.basicConfig(
-        level=logging.INFO,
+        level=os.environ.get('TRENDCLIP_LOG_LEVEL', 'WARNING').upper(),
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
     
@@ -0,0 +1,54 @@
+// TrendClip Desktop - Analytics charts
+// Builds the analytics figures in the browser from the clipstats.csv columns
+// stored in `analytics-data`, so zoom/pan and re-renders never hit the server.
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    analytics: {
+        updateCharts: function (data) {
+            var layout = {
+                template: "plotly_dark",
+                margin: {t: 40, r: 20, b: 40, l: 50}
+            };
+            if (!data || !data.timestamp || !data.timestamp.length) {
+                var empty = {data: [], layout: Object.assign({title: "No clip stats yet"}, layout)};
+                return [empty, empty];
+            }
+
+            var timestamps = data.timestamp;
+            var views = data.views || [];
+            var income = data.est_gbp || [];
+
+            // Views per clip, WebGL-rendered so large histories stay responsive
+            var viewsFigure = {
+                data: [{
+                    type: "scattergl",
+                    mode: "lines+markers",
+                    x: timestamps,
+                    y: views,
+                    text: data.title || [],
+                    name: "Views"
+                }],
+                layout: Object.assign({title: "Views per clip"}, layout)
+            };
+
+            // Income aggregated per day
+            var perDay = {};
+            for (var i = 0; i < timestamps.length; i++) {
+                var day = String(timestamps[i]).slice(0, 10);
+                perDay[day] = (perDay[day] || 0) + (Number(income[i]) || 0);
+            }
+            var days = Object.keys(perDay).sort();
+            var revenueFigure = {
+                data: [{
+                    type: "bar",
+                    x: days,
+                    y: days.map(function (d) { return perDay[d]; }),
+                    name: "Income (GBP)"
+                }],
+                layout: Object.assign({title: "Estimated income per day (GBP)"}, layout)
+            };
+
+            return [viewsFigure, revenueFigure];
+        }
+    }
+});
@@ -0,0 +1,7 @@
+// TrendClip Desktop - Register the static-asset service worker (assets/sw.js)
+
+if ("serviceWorker" in navigator) {
+    navigator.serviceWorker.register("/sw.js").catch(function () {
+        // Not fatal: the dashboard simply loads without the offline cache
+    });
+}
@@ -0,0 +1,37 @@
+// TrendClip Desktop - Service worker
+// Cache-first for fingerprinted Dash bundles and /assets files, so relaunches
+// of the desktop window render without waiting on the server for static files.
+// Served from /sw.js (see configure_server) so its scope covers the whole app.
+
+var CACHE_NAME = "trendclip-static-v1";
+
+self.addEventListener("install", function () {
+    self.skipWaiting();
+});
+
+self.addEventListener("activate", function (event) {
+    event.waitUntil(self.clients.claim());
+});
+
+self.addEventListener("fetch", function (event) {
+    var request = event.request;
+    if (request.method !== "GET") {
+        return;
+    }
+    var path = new URL(request.url).pathname;
+    if (path.indexOf("/_dash-component-suites/") !== 0 && path.indexOf("/assets/") !== 0) {
+        return;
+    }
+    event.respondWith(
+        caches.open(CACHE_NAME).then(function (cache) {
+            return cache.match(request).then(function (cached) {
+                return cached || fetch(request).then(function (response) {
+                    if (response.ok) {
+                        cache.put(request, response.clone());
+                    }
+                    return response;
+                });
+            });
+        })
+    );
+});
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+TrendClip Desktop - Config Loading
+Parses config.yaml, reusing a JSON sidecar cache while the file is unchanged
+"""
+
+import os
+import json
+import logging
+from pathlib import Path
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+# Use the libyaml C parser when PyYAML was built with it
+Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+def load_config_file(config_file: Path) -> dict:
+    """Load a YAML config, via config.cache.json when it matches the file's mtime and size"""
+    st = config_file.stat()
+    key = f"{st.st_mtime_ns}:{st.st_size}"
+    cache_file = config_file.with_suffix('.cache.json')
+
+    # Reuse the cached parse if config.yaml is unchanged
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            if f.readline().rstrip('\n') == key:
+                return json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    config = yaml.load(config_file.read_bytes(), Loader=Loader) or {}
+
+    # Write the cache atomically, but only if JSON gives back exactly the
+    # same config; YAML dates, int/bool keys etc. are never cached
+    try:
+        payload = json.dumps(config)
+        if json.loads(payload) != config:
+            raise ValueError("config does not round-trip through JSON")
+        tmp_file = cache_file.with_name(cache_file.name + '.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            f.write(key + '\n' + payload)
+        os.replace(tmp_file, cache_file)
+    except (OSError, TypeError, ValueError) as e:
+        logger.debug(f"Config cache not written: {e}")
+        try:
+            cache_file.unlink()
+        except OSError:
+            pass
+
+    return config
@@ -7,6 +7,7 @@ Integrates new features into existing installation
 import os
 import sys
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 def integrate_new_features():
@@ -29,12 +30,16 @@ def integrate_new_features():
         "packager.py"
     ]
     
+    # One directory scan instead of a stat per module
+    with os.scandir('.') as entries:
+        available = {entry.name for entry in entries if entry.is_file()}
+    to_copy = [module for module in new_modules if module in available]
+    
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda module: shutil.copy2(module, base_dir / module), to_copy))
+    
     for module in new_modules:
-        src = Path(module)
-        dst = base_dir / module
-        
-        if src.exists():
-            shutil.copy2(src, dst)
+        if module in available:
             print(f"✓ Copied {module}")
         else:
             print(f"✗ Module not found: {module}")
@@ -48,14 +53,19 @@ def integrate_new_features():
     ]
     
     if requirements_file.exists():
-        with open(requirements_file, 'r') as f:
+        with open(requirements_file, 'r', encoding='utf-8', newline='') as f:
             existing = f.read()
+        existing_pkgs = {line.split('>=')[0].split('==')[0].strip()
+                         for line in existing.splitlines() if line.strip()}
         
-        # Add new requirements if not present
-        for req in new_requirements:
-            if req.split('>=')[0] not in existing:
-                with open(requirements_file, 'a') as f:
-                    f.write(f"\n{req}")
+        # Add new requirements if not present, in a single write
+        to_add = [req for req in new_requirements if req.split('>=')[0] not in existing_pkgs]
+        if to_add:
+            # Keep the file's own line endings (newline='' leaves them untranslated)
+            eol = "\r\n" if "\r\n" in existing else "\n"
+            with open(requirements_file, 'w', encoding='utf-8', newline='') as f:
+                f.write(existing.rstrip() + eol + eol.join(to_add) + eol)
+            for req in to_add:
                 print(f"✓ Added requirement: {req}")
     else:
         print("✗ requirements.txt not found")
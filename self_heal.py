@@ -10,14 +10,46 @@ import hashlib
 import json
 import logging
 import subprocess
-import urllib.request
 import zipfile
 import tempfile
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 import platform
 
+# Download copy buffer, socket timeout (seconds) and progress logging interval
+DOWNLOAD_CHUNK = 1024 * 1024
+DOWNLOAD_TIMEOUT = 60
+PROGRESS_STEP = 8 * 1024 * 1024
+
+class _ProgressWriter:
+    """File wrapper that logs download progress every PROGRESS_STEP bytes, optionally hashing what it writes"""
+    
+    def __init__(self, f, total_size: int, logger: logging.Logger, hash_func=None):
+        self._f = f
+        self._hash_func = hash_func
+        self._total_size = total_size
+        self._logger = logger
+        self._step = 0
+        self.downloaded = 0
+    
+    def write(self, data) -> int:
+        written = self._f.write(data)
+        if self._hash_func is not None:
+            self._hash_func.update(data)
+        self.downloaded += len(data)
+        step = self.downloaded // PROGRESS_STEP
+        if step != self._step:
+            self._step = step
+            if self._total_size > 0:
+                progress = (self.downloaded / self._total_size) * 100
+                self._logger.info("Download progress: %.1f%%", progress)
+            else:
+                self._logger.info("Downloaded %.0f MB", self.downloaded / (1024 * 1024))
+        return written
+
 class SelfHealToolchain:
     """Self-healing toolchain for TrendClip Desktop"""
     
@@ -44,6 +76,13 @@ class SelfHealToolchain:
             }
         }
         
+        # HTTP session for tool downloads, created on first use
+        self._session = None
+        self._session_lock = threading.Lock()
+        
+        # Tools found so far: name -> (available, path); only hits are cached
+        self._tool_cache: Dict[str, Tuple[bool, str]] = {}
+        
         # Create tools directory
         self.tools_path.mkdir(parents=True, exist_ok=True)
     
@@ -59,10 +98,14 @@ class SelfHealToolchain:
     def calculate_file_checksum(self, file_path: str, algorithm: str = 'sha256') -> str:
         """Calculate file checksum"""
         try:
-            hash_func = hashlib.new(algorithm)
             with open(file_path, 'rb') as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_func.update(chunk)
+                if hasattr(hashlib, 'file_digest'):
+                    # Python 3.11+: hashed in C with large buffers, GIL released
+                    hash_func = hashlib.file_digest(f, algorithm)
+                else:
+                    hash_func = hashlib.new(algorithm)
+                    for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK), b""):
+                        hash_func.update(chunk)
             return f"{algorithm}:{hash_func.hexdigest()}"
         except Exception as e:
             self.logger.error(f"Failed to calculate checksum: {e}")
@@ -77,30 +120,49 @@ class SelfHealToolchain:
         actual_checksum = self.calculate_file_checksum(file_path)
         return actual_checksum == expected_checksum
     
-    def download_file(self, url: str, destination: str) -> bool:
-        """Download file from URL"""
+    def _get_session(self):
+        """Return the requests session shared by all downloads, so connections are kept alive"""
+        with self._session_lock:
+            if self._session is None:
+                import requests
+                
+                session = requests.Session()
+                # identity: store the bytes exactly as served
+                session.headers.update({'User-Agent': 'TrendClip-SelfHeal', 'Accept-Encoding': 'identity'})
+                self._session = session
+            return self._session
+    
+    def download_file(self, url: str, destination: str, expected_checksum: Optional[str] = None) -> bool:
+        """Download file from URL, verifying expected_checksum ("algo:hex") as the bytes arrive"""
         try:
             self.logger.info(f"Downloading {url} to {destination}")
             
+            hash_func = None
+            if expected_checksum is not None:
+                if not expected_checksum or expected_checksum == 'sha256:...':
+                    self.logger.warning("No checksum provided, skipping verification")
+                else:
+                    hash_func = hashlib.new(expected_checksum.split(':', 1)[0])
+            
             # Create destination directory
             os.makedirs(os.path.dirname(destination), exist_ok=True)
             
             # Download with progress
-            with urllib.request.urlopen(url) as response:
+            with self._get_session().get(url, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+                response.raise_for_status()
                 total_size = int(response.headers.get('content-length', 0))
-                downloaded = 0
+                response.raw.decode_content = True
                 
                 with open(destination, 'wb') as f:
-                    while True:
-                        chunk = response.read(8192)
-                        if not chunk:
-                            break
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        
-                        if total_size > 0:
-                            progress = (downloaded / total_size) * 100
-                            self.logger.info(f"Download progress: {progress:.1f}%")
+                    shutil.copyfileobj(response.raw, _ProgressWriter(f, total_size, self.logger, hash_func),
+                                       length=DOWNLOAD_CHUNK)
+            
+            if hash_func is not None:
+                actual_checksum = f"{hash_func.name}:{hash_func.hexdigest()}"
+                if actual_checksum != expected_checksum:
+                    self.logger.error(f"Checksum mismatch for {url}: {actual_checksum}")
+                    os.unlink(destination)
+                    return False
             
             return True
             
@@ -122,36 +184,67 @@ class SelfHealToolchain:
             self.logger.error(f"Extraction failed: {e}")
             return False
     
-    def check_tool_availability(self, tool_name: str) -> Tuple[bool, str]:
-        """Check if tool is available and working"""
+    def extract_zip_members(self, zip_path: str, names: Tuple[str, ...], extract_to: str) -> bool:
+        """Extract the members whose base names are in names, flattened into extract_to"""
+        try:
+            self.logger.info(f"Extracting {', '.join(names)} from {zip_path} to {extract_to}")
+            os.makedirs(extract_to, exist_ok=True)
+            
+            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+                for member in zip_ref.namelist():
+                    name = member.rsplit('/', 1)[-1]
+                    if name not in names:
+                        continue
+                    with zip_ref.open(member) as src, open(os.path.join(extract_to, name), 'wb') as dst:
+                        shutil.copyfileobj(src, dst, DOWNLOAD_CHUNK)
+            
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Extraction failed: {e}")
+            return False
+    
+    def _locate_tool(self, tool_name: str) -> Optional[str]:
+        """Find a tool's executable without running it: tools directory first, then PATH"""
+        executable = self.tools[tool_name]['executable']
+        tool_path = self.tools_path / executable
+        if tool_path.exists() and os.access(tool_path, os.X_OK):
+            return str(tool_path)
+        return shutil.which(executable) or shutil.which(tool_name)
+    
+    def check_tool_availability(self, tool_name: str, deep: bool = False) -> Tuple[bool, str]:
+        """Check if tool is available; deep also runs it with --version"""
         if tool_name not in self.tools:
             return False, f"Unknown tool: {tool_name}"
         
-        tool_info = self.tools[tool_name]
-        executable = tool_info['executable']
+        if not deep and tool_name in self._tool_cache:
+            return self._tool_cache[tool_name]
         
-        # Check in tools directory first
-        tool_path = self.tools_path / executable
-        if tool_path.exists():
+        path = self._locate_tool(tool_name)
+        if not path:
+            return False, ""
+        
+        if deep:
             # Test if it works
             try:
-                result = subprocess.run([str(tool_path), '--version'], 
+                result = subprocess.run([path, '--version'], 
                                       capture_output=True, text=True, timeout=10)
-                if result.returncode == 0:
-                    return True, str(tool_path)
+                if result.returncode != 0:
+                    return False, ""
             except Exception as e:
                 self.logger.warning(f"Tool test failed: {e}")
+                return False, ""
         
-        # Check system PATH
-        try:
-            result = subprocess.run([executable, '--version'], 
-                                  capture_output=True, text=True, timeout=10)
-            if result.returncode == 0:
-                return True, executable
-        except Exception:
-            pass
-        
-        return False, ""
+        return self._remember_tool(tool_name, path)
+    
+    def _remember_tool(self, tool_name: str, path: str) -> Tuple[bool, str]:
+        """Cache a found tool so later checks skip the filesystem and subprocess probes"""
+        self._tool_cache[tool_name] = (True, path)
+        return True, path
+    
+    def is_tool_installed(self, tool_name: str) -> bool:
+        """Check if a tool is present without running it (no subprocess)"""
+        return self.check_tool_availability(tool_name)[0]
     
     def install_ffmpeg(self) -> bool:
         """Install FFmpeg"""
@@ -165,32 +258,21 @@ class SelfHealToolchain:
             with tempfile.NamedTemporaryFile(suffix='.zip', delete=False) as tmp_file:
                 temp_zip = tmp_file.name
             
-            if not self.download_file(url, temp_zip):
+            if not self.download_file(url, temp_zip, tool_info['checksum']):
                 return False
             
-            # Extract to tools directory
-            ffmpeg_dir = self.tools_path / "ffmpeg"
-            if not self.extract_zip(temp_zip, str(self.tools_path)):
+            # Extract only the executables, straight into tools/ffmpeg/bin/
+            bin_dir = self.tools_path / "ffmpeg" / "bin"
+            executables = (tool_info['executable'], tool_info['probe_executable'])
+            if not self.extract_zip_members(temp_zip, executables, str(bin_dir)):
                 return False
             
-            # Find and move executables
-            extract_path = self.tools_path / tool_info['extract_path']
-            if extract_path.exists():
-                # Move executables to tools/ffmpeg/bin/
-                bin_dir = ffmpeg_dir / "bin"
-                bin_dir.mkdir(parents=True, exist_ok=True)
-                
-                for exe in ['ffmpeg.exe', 'ffprobe.exe']:
-                    src = extract_path / exe
-                    dst = bin_dir / exe
-                    if src.exists():
-                        shutil.move(str(src), str(dst))
-            
             # Clean up
             os.unlink(temp_zip)
             
             # Verify installation
-            available, path = self.check_tool_availability('ffmpeg')
+            self._tool_cache.pop('ffmpeg', None)
+            available, path = self.check_tool_availability('ffmpeg', deep=True)
             if available:
                 self.logger.info(f"FFmpeg installed successfully: {path}")
                 return True
@@ -213,7 +295,7 @@ class SelfHealToolchain:
             # Download directly to tools directory
             destination = self.tools_path / tool_info['executable']
             
-            if not self.download_file(url, str(destination)):
+            if not self.download_file(url, str(destination), tool_info['checksum']):
                 return False
             
             # Make executable (on Unix systems)
@@ -221,7 +303,8 @@ class SelfHealToolchain:
                 os.chmod(destination, 0o755)
             
             # Verify installation
-            available, path = self.check_tool_availability('yt-dlp')
+            self._tool_cache.pop('yt-dlp', None)
+            available, path = self.check_tool_availability('yt-dlp', deep=True)
             if available:
                 self.logger.info(f"yt-dlp installed successfully: {path}")
                 return True
@@ -253,13 +336,11 @@ class SelfHealToolchain:
             return False
     
     def heal_all_tools(self) -> Dict[str, bool]:
-        """Heal all tools"""
-        results = {}
-        
-        for tool_name in self.tools.keys():
-            results[tool_name] = self.heal_tool(tool_name)
-        
-        return results
+        """Heal all tools, downloading them concurrently"""
+        # Each tool installs into its own paths, so the workers share no state
+        with ThreadPoolExecutor(max_workers=len(self.tools)) as executor:
+            futures = {name: executor.submit(self.heal_tool, name) for name in self.tools}
+            return {name: future.result() for name, future in futures.items()}
     
     def get_tool_path(self, tool_name: str) -> Optional[str]:
         """Get the path to a tool"""
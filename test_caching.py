@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Tests for the on-disk and in-memory caches (config JSON sidecar, FFprobe results)
+and the single-pass process_all command built from cached probe results
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+from config_cache import load_config_file as _load_config
+
+def test_config_cache_int_keys():
+    """Configs JSON can't round-trip (int keys) load the same every time and are not cached"""
+    with tempfile.TemporaryDirectory() as tmp:
+        config_file = Path(tmp) / "config.yaml"
+        config_file.write_text("region: GB\nthresholds:\n  1: low\n  2: high\n", encoding="utf-8")
+
+        first = _load_config(config_file)
+        second = _load_config(config_file)
+
+        assert first == {'region': 'GB', 'thresholds': {1: 'low', 2: 'high'}}
+        assert second == first
+        assert not config_file.with_suffix('.cache.json').exists()
+
+def test_config_cache_plain():
+    """Plain configs are cached and the cached load matches the YAML load"""
+    with tempfile.TemporaryDirectory() as tmp:
+        config_file = Path(tmp) / "config.yaml"
+        config_file.write_text("region: GB\ncpm_gbp: 3.5\napp:\n  port: 0\n", encoding="utf-8")
+
+        first = _load_config(config_file)
+        assert config_file.with_suffix('.cache.json').exists()
+        assert _load_config(config_file) == first == {'region': 'GB', 'cpm_gbp': 3.5, 'app': {'port': 0}}
+
+def test_config_cache_invalidation():
+    """Editing config.yaml (new size, or same size with a new mtime) bypasses the cache"""
+    with tempfile.TemporaryDirectory() as tmp:
+        config_file = Path(tmp) / "config.yaml"
+        config_file.write_text("region: GB\n", encoding="utf-8")
+        assert _load_config(config_file) == {'region': 'GB'}
+
+        config_file.write_text("region: USA\n", encoding="utf-8")
+        assert _load_config(config_file) == {'region': 'USA'}
+
+        # Same size: only the mtime tells the edit apart
+        st = config_file.stat()
+        config_file.write_text("region: FRA\n", encoding="utf-8")
+        os.utime(config_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        assert _load_config(config_file) == {'region': 'FRA'}
+
+def _seeded_processor(video: Path, streams: tuple = (), duration: str = '12.5'):
+    """A VideoProcessor whose probe cache already holds a result for video"""
+    from video_processor import VideoProcessor, _video_meta
+
+    # No FFprobe is ever run successfully: a cache miss raises FileNotFoundError
+    processor = VideoProcessor({'ffmpeg_path': str(video.parent / "missing-ffmpeg")})
+    processor.ffprobe_path = str(video.parent / "missing-ffprobe")
+
+    info = {'streams': [{'codec_type': 'video', 'width': 1920, 'height': 1080}, *streams],
+            'format': {'duration': duration}}
+    st = video.stat()
+    processor._probe_cache[str(video)] = ((st.st_mtime_ns, st.st_size), info, _video_meta(info))
+    return processor, info
+
+def test_probe_cache_hit():
+    """An unchanged file is answered from the cache without running FFprobe"""
+    with tempfile.TemporaryDirectory() as tmp:
+        video = Path(tmp) / "clip.mp4"
+        video.write_bytes(b"\0" * 2048)
+        processor, info = _seeded_processor(video)
+
+        assert processor.get_video_info(str(video)) is info
+        assert processor.get_video_meta(str(video)).width == 1920
+        assert processor.get_video_duration(str(video)) == 12.5
+        assert processor.validate_output(str(video))
+
+def test_probe_cache_invalidation():
+    """A new size or mtime makes the next lookup probe the file again"""
+    with tempfile.TemporaryDirectory() as tmp:
+        video = Path(tmp) / "clip.mp4"
+        video.write_bytes(b"\0" * 2048)
+
+        processor, _ = _seeded_processor(video)
+        st = video.stat()
+        with open(video, 'ab') as f:
+            f.write(b"\0")
+        # Same mtime: only the size tells the change apart
+        os.utime(video, ns=(st.st_atime_ns, st.st_mtime_ns))
+        try:
+            processor.get_video_info(str(video))
+            raise AssertionError("size change was served from the cache")
+        except FileNotFoundError:
+            pass
+
+        processor, _ = _seeded_processor(video)
+        st = video.stat()
+        os.utime(video, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        try:
+            processor.get_video_info(str(video))
+            raise AssertionError("mtime change was served from the cache")
+        except FileNotFoundError:
+            pass
+
+def test_probe_cache_bounded():
+    """The probe cache holds at most PROBE_CACHE_SIZE files, dropping the oldest"""
+    import shutil
+    import subprocess
+    import pytest
+    from video_processor import VideoProcessor, PROBE_CACHE_SIZE
+
+    ffmpeg = shutil.which("ffmpeg")
+    if not ffmpeg or not shutil.which("ffprobe"):
+        pytest.skip("FFmpeg/FFprobe not on PATH")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video = Path(tmp) / "clip.mp4"
+        subprocess.run([ffmpeg, "-v", "quiet", "-f", "lavfi", "-i", "testsrc=size=64x64:duration=1",
+                        "-y", str(video)], check=True)
+        processor = VideoProcessor({'ffmpeg_path': ffmpeg})
+        for i in range(PROBE_CACHE_SIZE):
+            processor._probe_cache[f"old-{i}"] = ((0, 0), {}, None)
+
+        assert processor.get_video_meta(str(video)).width == 64
+        assert len(processor._probe_cache) == PROBE_CACHE_SIZE
+        assert "old-0" not in processor._probe_cache and str(video) in processor._probe_cache
+
+def _record_ffmpeg(processor, video: Path):
+    """Capture the FFmpeg commands the processor runs, creating their outputs instead"""
+    commands = []
+
+    def run(cmd, loglevel='error'):
+        commands.append(cmd)
+        for arg in cmd:
+            if arg.startswith(str(video.parent)) and arg != str(video):
+                Path(arg).write_bytes(b"\0")
+        return []
+
+    processor._run_ffmpeg = run
+    return commands
+
+def test_process_all_without_audio():
+    """A source without an audio stream gets no audio output instead of failing the run"""
+    with tempfile.TemporaryDirectory() as tmp:
+        video = Path(tmp) / "clip.mp4"
+        video.write_bytes(b"\0" * 2048)
+        processor, _ = _seeded_processor(video)
+        commands = _record_ffmpeg(processor, video)
+
+        audio_out = str(Path(tmp) / "clip.m4a")
+        assert processor.process_all(str(video), str(Path(tmp) / "out.mp4"),
+                                     thumb_out=str(Path(tmp) / "thumb.jpg"), audio_out=audio_out)
+        (cmd,) = commands
+        assert audio_out not in cmd and not Path(audio_out).exists()
+        assert "trim=start=1," in cmd[cmd.index('-filter_complex') + 1]
+
+def test_process_all_short_source_thumbnail():
+    """Sources shorter than a second take the thumbnail from the first frame"""
+    with tempfile.TemporaryDirectory() as tmp:
+        video = Path(tmp) / "clip.mp4"
+        video.write_bytes(b"\0" * 2048)
+        processor, _ = _seeded_processor(video, streams=({'codec_type': 'audio', 'codec_name': 'aac'},),
+                                         duration='0.5')
+        commands = _record_ffmpeg(processor, video)
+
+        audio_out = str(Path(tmp) / "clip.m4a")
+        assert processor.process_all(str(video), str(Path(tmp) / "out.mp4"),
+                                     thumb_out=str(Path(tmp) / "thumb.jpg"), audio_out=audio_out)
+        (cmd,) = commands
+        assert audio_out in cmd
+        assert "trim=start=0," in cmd[cmd.index('-filter_complex') + 1]
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Tests for the packager's include/exclude matching
+"""
+
+import fnmatch
+import tempfile
+from pathlib import Path
+
+from packager import TrendClipPackager
+
+# Files of the sample tree (relative to the base folder)
+TREE = [
+    "README.md",
+    "LICENSE",
+    "config.yaml",
+    "config.cache.json",
+    "app.py",
+    "notes.log",
+    "x.tmp",
+    "image.png",
+    "assets/style.css",
+    "assets/logo.png",
+    "assets/debug.log",
+    "assets/sub/x.bin",
+    "__pycache__/app.cpython-311.pyc",
+    "clips/c.mp4",
+    "data/d.json",
+    "scripts/run.sh",
+    "docs/guide.md",
+    ".secrets/token.json",
+    "venv/lib/site.py",
+    "environment_notes/readme.txt",
+    "tools/ffmpeg/bin/ffmpeg.exe",
+    "src/module.py",
+    "src/.env",
+    "src/deep/nested/util.py",
+    "downloads/a.txt",
+    "sub/dir/data_file.txt",
+    ".webview_cache/Cache/index",
+]
+
+def _legacy_should_include(packager: TrendClipPackager, file_path: Path) -> bool:
+    """The original substring/Path.match rules, with glob excludes applied to the name
+
+    (the original compared "*.log" etc. as literal substrings, so they never matched)
+    """
+    file_str = str(file_path)
+    for pattern in packager.exclude_patterns:
+        if any(c in pattern for c in "*?["):
+            if fnmatch.fnmatchcase(file_path.name, pattern):
+                return False
+        elif pattern in file_str:
+            return False
+    if any(exclude_dir in file_str for exclude_dir in packager.exclude_dirs):
+        return False
+    if any(file_path.match(pattern) for pattern in packager.include_patterns):
+        return True
+    if any(include_dir in file_str for include_dir in packager.include_dirs):
+        return True
+    return file_path.name in packager.important_files
+
+def _make_tree(base: Path):
+    for relative in TREE:
+        path = base / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"x")
+
+def _packaged(packager: TrendClipPackager) -> set:
+    return {Path(packager._relative(path)).as_posix() for path, _ in packager.get_files_to_package()}
+
+def _expected(packager: TrendClipPackager, base: Path) -> set:
+    return {relative for relative in TREE if _legacy_should_include(packager, base / relative)}
+
+def _base_dir(tmp: str) -> Path:
+    # The rules are substring matches on the whole path, so keep the base name neutral
+    base = Path(tmp) / "pkgbase"
+    base.mkdir()
+    return base
+
+def test_matches_legacy_rules():
+    """Fused regexes, suffix sets and per-directory verdicts give the original results"""
+    with tempfile.TemporaryDirectory(prefix="tc") as tmp:
+        base = _base_dir(tmp)
+        _make_tree(base)
+        packager = TrendClipPackager(str(base))
+
+        packaged = _packaged(packager)
+        assert packaged == _expected(packager, base), packaged ^ _expected(packager, base)
+        assert "assets/style.css" in packaged
+        assert "assets/debug.log" not in packaged
+        assert "src/deep/nested/util.py" in packaged
+        assert "config.cache.json" not in packaged
+        assert not any(path.startswith(".webview_cache/") for path in packaged)
+
+def test_recompile_after_pattern_change():
+    """compile_patterns picks up edited lists and drops cached directory verdicts"""
+    with tempfile.TemporaryDirectory(prefix="tc") as tmp:
+        base = _base_dir(tmp)
+        _make_tree(base)
+        packager = TrendClipPackager(str(base))
+
+        packaged = _packaged(packager)
+        assert "image.png" not in packaged and "src/module.py" in packaged
+        assert packager.should_include_file(base / "src" / "deep" / "nested" / "util.py")
+
+        packager.include_patterns.append("*.png")
+        packager.exclude_dirs.append("src")
+        packager.compile_patterns()
+
+        packaged = _packaged(packager)
+        assert packaged == _expected(packager, base), packaged ^ _expected(packager, base)
+        assert "image.png" in packaged
+        assert not any(path.startswith("src/") for path in packaged)
+        # The walk prunes src/ by name, so ask about a file under it directly
+        assert not packager.should_include_file(base / "src" / "deep" / "nested" / "util.py")
+
+def test_glob_patterns_use_regex():
+    """Globs that are not plain "*.ext" still match through the fused regex"""
+    with tempfile.TemporaryDirectory(prefix="tc") as tmp:
+        base = _base_dir(tmp)
+        packager = TrendClipPackager(str(base))
+        packager.exclude_patterns.append("draft_*")
+        packager.include_patterns.append("Makefile*")
+        packager.compile_patterns()
+
+        assert not packager.should_include_file(base / "draft_notes.md")
+        assert packager.should_include_file(base / "Makefile.win")
+        assert not packager.should_include_file(base / "notes.bin")
@@ -5,22 +5,149 @@ Implements 9:16 vertical transform with smart framing and audio processing
 """
 
 import os
+import re
+import functools
 import subprocess
+import threading
 import json
 import logging
+import math
+from collections import deque
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, NamedTuple, Optional, Tuple
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 import shutil
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# FFmpeg stderr lines kept for error reporting
+STDERR_TAIL_LINES = 500
+
+# EBU R128 targets for the loudnorm audio filter
+LOUDNORM_TARGET = 'loudnorm=I=-16:TP=-1.5:LRA=11'
+LOUDNORM_MEASURED = ('input_i', 'input_tp', 'input_lra', 'input_thresh', 'target_offset')
+
+# Files whose FFprobe result is kept per VideoProcessor
+PROBE_CACHE_SIZE = 256
+
+# The crop=W:H:X:Y boxes cropdetect writes to the log
+_CROPDETECT_RE = re.compile(r"crop=(\d+):(\d+):(\d+):(\d+)")
+
+@functools.lru_cache(maxsize=None)
+def _discover_ffmpeg() -> str:
+    """Find FFmpeg in the common locations (searched once per process, once found)"""
+    common_paths = [
+        r"%USERPROFILE%\TrendClipOne\tools\ffmpeg\bin\ffmpeg.exe",
+        r"C:\ffmpeg\bin\ffmpeg.exe"
+    ]
+    
+    for path in common_paths:
+        expanded_path = os.path.expandvars(path)
+        if os.path.exists(expanded_path):
+            return expanded_path
+    
+    # System PATH (honours PATHEXT on Windows)
+    path = shutil.which('ffmpeg')
+    if path:
+        return path
+    
+    raise FileNotFoundError("FFmpeg not found. Please install FFmpeg or set FFMPEG_BIN environment variable.")
+
+@functools.lru_cache(maxsize=None)
+def _ffprobe_for(ffmpeg_path: str) -> str:
+    """FFprobe next to the given FFmpeg binary, else the one on PATH"""
+    directory, name = os.path.split(ffmpeg_path)
+    sibling = os.path.join(directory, name.replace('ffmpeg', 'ffprobe'))
+    if directory and os.path.exists(sibling):
+        return sibling
+    return shutil.which('ffprobe') or 'ffprobe'
+
+class VideoMeta(NamedTuple):
+    """The FFprobe fields the processor uses (first video and audio stream)"""
+    width: int
+    height: int
+    duration: float
+    v_codec: Optional[str]
+    a_codec: Optional[str]
+    sample_rate: int
+    channels: int
+
+def _video_meta(info: Dict) -> VideoMeta:
+    """Summarize parsed FFprobe output as a VideoMeta"""
+    streams = info.get('streams', [])
+    video = next((stream for stream in streams if stream.get('codec_type') == 'video'), None)
+    audio = next((stream for stream in streams if stream.get('codec_type') == 'audio'), None)
+    return VideoMeta(
+        width=int(video.get('width', 0)) if video else 0,
+        height=int(video.get('height', 0)) if video else 0,
+        duration=float(info.get('format', {}).get('duration', 0)),
+        v_codec=video.get('codec_name', '') if video else None,
+        a_codec=audio.get('codec_name', '') if audio else None,
+        sample_rate=int(audio.get('sample_rate', 0)) if audio else 0,
+        channels=int(audio.get('channels', 0)) if audio else 0
+    )
+
+# Default preset/CRF of the CPU encoders clip.encoder may name. ultrafast x264
+# roughly doubles throughput over veryfast for ~25% larger files; SVT-AV1 presets
+# are numeric (10+ is faster than x264 veryfast at a smaller size).
+SOFTWARE_ENCODERS = {
+    'libx264': {'preset': 'veryfast', 'crf': 23},
+    'libsvtav1': {'preset': 10, 'crf': 35}
+}
+
+# Hardware H.264 encoders for the clip.hwaccel config key ("auto" tries them in this order).
+# Decoding is offloaded where it returns frames in system memory, so the crop/scale
+# filters stay on the CPU; VAAPI uploads the filtered frames to the GPU for encoding.
+HW_ENCODERS = {
+    'nvenc': {
+        'encoder': 'h264_nvenc',
+        'input_args': ['-hwaccel', 'cuda'],
+        'filter_suffix': '',
+        'quality_args': ['-preset', 'p4', '-rc', 'vbr', '-cq', '23', '-pix_fmt', 'yuv420p']
+    },
+    'qsv': {
+        'encoder': 'h264_qsv',
+        'input_args': ['-hwaccel', 'qsv'],
+        'filter_suffix': '',
+        'quality_args': ['-global_quality', '23', '-pix_fmt', 'nv12']
+    },
+    'videotoolbox': {
+        'encoder': 'h264_videotoolbox',
+        'input_args': ['-hwaccel', 'videotoolbox'],
+        'filter_suffix': '',
+        'quality_args': ['-q:v', '60', '-pix_fmt', 'yuv420p']
+    },
+    'vaapi': {
+        'encoder': 'h264_vaapi',
+        'input_args': ['-vaapi_device', '/dev/dri/renderD128'],
+        'filter_suffix': ',format=nv12,hwupload',
+        'quality_args': ['-qp', '23']
+    }
+}
+
 class VideoProcessor:
     """Handles video processing including 9:16 vertical transform"""
     
     def __init__(self, config: Dict):
         self.config = config
         self.ffmpeg_path = self._get_ffmpeg_path()
+        self.ffprobe_path = _ffprobe_for(self.ffmpeg_path)
         self.logger = logging.getLogger(__name__)
         
+        # FFprobe results: path -> ((mtime_ns, size), info, meta)
+        self._probe_cache = {}
+        self._probe_lock = threading.Lock()
+        
+        # loudnorm analysis: (path, duration, mtime_ns, size) -> measured values
+        self._loudness_cache = {}
+        
+        # Encoder names FFmpeg was built with, listed on first hwaccel use
+        self._encoders = None
+        
     def _get_ffmpeg_path(self) -> str:
         """Get FFmpeg path from config or environment"""
         # Check config first
@@ -33,33 +160,70 @@ class VideoProcessor:
             return ffmpeg_env
             
         # Check common locations
-        common_paths = [
-            r"%USERPROFILE%\TrendClipOne\tools\ffmpeg\bin\ffmpeg.exe",
-            r"C:\ffmpeg\bin\ffmpeg.exe",
-            "ffmpeg"  # System PATH
-        ]
+        return _discover_ffmpeg()
+    
+    def _run_ffmpeg(self, cmd: List[str], loglevel: str = 'error') -> deque:
+        """Run an FFmpeg command, keeping only the tail of its stderr
         
-        for path in common_paths:
-            expanded_path = os.path.expandvars(path)
-            if os.path.exists(expanded_path):
-                return expanded_path
-                
-        raise FileNotFoundError("FFmpeg not found. Please install FFmpeg or set FFMPEG_BIN environment variable.")
+        stderr is drained on a thread as it is written, so long encodes never
+        fill the pipe or buffer the whole log. Raises CalledProcessError (with
+        the tail as stderr) on a non-zero exit; returns the tail otherwise.
+        """
+        cmd = [cmd[0], '-nostdin', '-hide_banner', '-nostats', '-loglevel', loglevel, *cmd[1:]]
+        tail = deque(maxlen=STDERR_TAIL_LINES)
+        
+        process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                   text=True, errors='replace')
+        drain = threading.Thread(target=lambda: tail.extend(line.rstrip('\n') for line in process.stderr),
+                                 daemon=True)
+        drain.start()
+        returncode = process.wait()
+        drain.join()
+        process.stderr.close()
+        
+        if returncode:
+            raise subprocess.CalledProcessError(returncode, cmd, stderr='\n'.join(tail))
+        return tail
     
     def get_video_info(self, input_path: str) -> Dict:
-        """Get video information using FFprobe"""
+        """Get video information using FFprobe, reusing the result while the file is unchanged"""
+        return self._probe(input_path)[0]
+    
+    def get_video_meta(self, input_path: str) -> VideoMeta:
+        """Get the VideoMeta summary of a file (same cached FFprobe run as get_video_info)"""
+        return self._probe(input_path)[1]
+    
+    def _probe(self, input_path: str, stat: Optional[os.stat_result] = None) -> Tuple[Dict, VideoMeta]:
+        """Run FFprobe on a file, or return the cached (info, meta) while it is unchanged"""
         try:
+            if stat is None:
+                stat = os.stat(input_path)
+            key = (stat.st_mtime_ns, stat.st_size)
+            with self._probe_lock:
+                cached = self._probe_cache.get(input_path)
+            if cached and cached[0] == key:
+                return cached[1:]
+            
             cmd = [
-                self.ffmpeg_path.replace('ffmpeg.exe', 'ffprobe.exe'),
+                self.ffprobe_path,
                 '-v', 'quiet',
+                '-probesize', '5M',  # Stream headers are near the start; don't read further
+                '-analyzeduration', '5M',
                 '-print_format', 'json',
                 '-show_format',
                 '-show_streams',
                 input_path
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            return json.loads(result.stdout)
+            result = subprocess.run(cmd, capture_output=True, check=True)
+            info = orjson.loads(result.stdout) if orjson is not None else json.loads(result.stdout)
+            meta = _video_meta(info)
+            with self._probe_lock:
+                if len(self._probe_cache) >= PROBE_CACHE_SIZE:
+                    # Drop the oldest entry (dicts keep insertion order)
+                    del self._probe_cache[next(iter(self._probe_cache))]
+                self._probe_cache[input_path] = (key, info, meta)
+            return info, meta
             
         except subprocess.CalledProcessError as e:
             self.logger.error(f"FFprobe failed: {e}")
@@ -78,11 +242,50 @@ class VideoProcessor:
                     return width, height
         return 16, 9  # Default fallback
     
-    def calculate_crop_parameters(self, input_path: str, target_aspect: str = "9:16") -> Dict:
-        """Calculate smart crop parameters for 9:16 transform"""
+    def detect_crop(self, input_path: str, sample_seconds: int = 10) -> Optional[Tuple[int, int, int, int]]:
+        """Find the picture area (width, height, x, y) without black bars using FFmpeg's cropdetect"""
+        cmd = [
+            self.ffmpeg_path,
+            '-t', str(sample_seconds),
+            '-i', input_path,
+            '-vf', 'cropdetect=24:16:0',
+            '-an',
+            '-f', 'null',
+            '-'
+        ]
+        try:
+            # cropdetect reports at info level
+            tail = self._run_ffmpeg(cmd, loglevel='info')
+        except (OSError, subprocess.CalledProcessError) as e:
+            self.logger.warning(f"cropdetect failed: {e}")
+            return None
+        
+        # The last reported box has seen the most frames
+        matches = _CROPDETECT_RE.findall('\n'.join(tail))
+        if not matches:
+            return None
+        return tuple(int(v) for v in matches[-1])
+    
+    def calculate_crop_parameters(self, input_path: str, target_aspect: str = "9:16",
+                                  video_info: Optional[Dict] = None) -> Dict:
+        """Calculate smart crop parameters for 9:16 transform
+        
+        With clip.cropdetect enabled in the config the crop is framed inside the
+        detected picture area (one FFmpeg sample pass instead of FFprobe).
+        Otherwise the frame size comes from video_info, probing only if not given.
+        """
         try:
-            video_info = self.get_video_info(input_path)
-            width, height = self.detect_aspect_ratio(video_info)
+            offset_x = offset_y = 0
+            box = None
+            if self.config.get('clip', {}).get('cropdetect'):
+                box = self.detect_crop(input_path)
+            if box:
+                width, height, offset_x, offset_y = box
+            elif video_info is not None:
+                width, height = self.detect_aspect_ratio(video_info)
+            else:
+                meta = self.get_video_meta(input_path)
+                width, height = (meta.width, meta.height) if meta.width and meta.height else (16, 9)
             
             # Parse target aspect ratio
             target_w, target_h = map(int, target_aspect.split(':'))
@@ -106,11 +309,15 @@ class VideoProcessor:
                 crop_width = width
                 crop_height = new_height
             
+            # Integer rounding leaves the crop at most one pixel off the target ratio
+            ratio_exact = abs(crop_width * target_h - crop_height * target_w) <= max(target_w, target_h)
+            
             return {
-                'crop_x': crop_x,
-                'crop_y': crop_y,
+                'crop_x': crop_x + offset_x,
+                'crop_y': crop_y + offset_y,
                 'crop_width': crop_width,
                 'crop_height': crop_height,
+                'ratio_exact': ratio_exact,
                 'original_width': width,
                 'original_height': height,
                 'target_width': int(crop_width),
@@ -129,7 +336,190 @@ class VideoProcessor:
                 'target_height': 1920
             }
     
-    def process_to_9_16(self, input_path: str, output_path: str, duration: int = 60) -> bool:
+    def _vertical_filter(self, crop_params: Dict) -> str:
+        """Build the crop/scale filter for a 1080x1920 output"""
+        crop = f"crop={crop_params['crop_width']}:{crop_params['crop_height']}:{crop_params['crop_x']}:{crop_params['crop_y']}"
+        if crop_params.get('ratio_exact'):
+            # Crop already has the 9:16 shape: one straight scale, no letterboxing
+            return f"{crop},scale=1080:1920"
+        return f"{crop},scale=1080:1920:force_original_aspect_ratio=decrease,pad=1080:1920:(ow-iw)/2:(oh-ih)/2:black"
+    
+    def _get_hw_encoder(self) -> Optional[Dict]:
+        """Return the HW_ENCODERS entry selected by clip.hwaccel in the config, if FFmpeg has it"""
+        choice = self.config.get('clip', {}).get('hwaccel')
+        if not choice:
+            return None
+        
+        if self._encoders is None:
+            # Probed once, on first use rather than at startup
+            try:
+                result = subprocess.run([self.ffmpeg_path, '-hide_banner', '-encoders'],
+                                        capture_output=True, text=True, check=True)
+                self._encoders = {line.split()[1] for line in result.stdout.splitlines()
+                                  if len(line.split()) > 1}
+            except (OSError, subprocess.CalledProcessError) as e:
+                self.logger.warning(f"Could not list FFmpeg encoders: {e}")
+                self._encoders = set()
+        
+        names = list(HW_ENCODERS) if choice == 'auto' else [choice]
+        for name in names:
+            hw = HW_ENCODERS.get(name)
+            if hw and hw['encoder'] in self._encoders:
+                return hw
+        
+        self.logger.warning(f"No hardware H.264 encoder for hwaccel={choice}, using the software encoder")
+        return None
+    
+    def _measure_loudness(self, input_path: str, duration: int) -> Optional[Dict]:
+        """Measure the clip's loudness with a loudnorm analysis pass, cached while the file is unchanged"""
+        try:
+            stat = os.stat(input_path)
+            key = (input_path, duration, stat.st_mtime_ns, stat.st_size)
+            with self._probe_lock:
+                if key in self._loudness_cache:
+                    return self._loudness_cache[key]
+            
+            cmd = [
+                self.ffmpeg_path,
+                '-t', str(duration),
+                '-i', input_path,
+                '-vn',
+                '-af', f"{LOUDNORM_TARGET}:print_format=json",
+                '-f', 'null',
+                '-'
+            ]
+            # The JSON summary is logged at info level, after everything else
+            tail = '\n'.join(self._run_ffmpeg(cmd, loglevel='info'))
+            measured = json.loads(tail[tail.rindex('{'):tail.rindex('}') + 1])
+            # Silent audio measures as -inf, which loudnorm won't accept back
+            if not all(math.isfinite(float(measured[name])) for name in LOUDNORM_MEASURED):
+                raise ValueError(f"unusable measurement {measured}")
+        except (OSError, KeyError, ValueError, subprocess.CalledProcessError) as e:
+            self.logger.warning(f"Loudness measurement failed, using single-pass loudnorm: {e}")
+            return None
+        
+        with self._probe_lock:
+            if len(self._loudness_cache) >= PROBE_CACHE_SIZE:
+                del self._loudness_cache[next(iter(self._loudness_cache))]
+            self._loudness_cache[key] = measured
+        return measured
+    
+    def _audio_args(self, input_path: str, duration: int) -> List[str]:
+        """Audio codec arguments for the 9:16 encode
+        
+        Audio is normalized and re-encoded to AAC 48 kHz stereo unless
+        clip.loudnorm is turned off and the source is already in that format,
+        in which case it is copied as-is. With clip.loudnorm set to "measured"
+        the clip is analysed first (once per source and duration) and loudnorm
+        applies the measured values linearly.
+        """
+        loudnorm = self.config.get('clip', {}).get('loudnorm', True)
+        if not loudnorm:
+            try:
+                meta = self.get_video_meta(input_path)
+            except (OSError, subprocess.CalledProcessError, json.JSONDecodeError):
+                meta = None
+            if meta and meta.a_codec == 'aac' and meta.sample_rate == 48000 and meta.channels == 2:
+                return ['-c:a', 'copy']
+            return ['-c:a', 'aac', '-b:a', '128k', '-ar', '48000', '-ac', '2']
+        
+        audio_filter = LOUDNORM_TARGET
+        measured = self._measure_loudness(input_path, duration) if loudnorm == 'measured' else None
+        if measured:
+            audio_filter += (f":measured_I={measured['input_i']}:measured_TP={measured['input_tp']}"
+                             f":measured_LRA={measured['input_lra']}:measured_thresh={measured['input_thresh']}"
+                             f":offset={measured['target_offset']}:linear=true")
+        
+        return [
+            '-c:a', 'aac',
+            '-b:a', '128k',
+            '-ar', '48000',
+            '-ac', '2',
+            '-af', audio_filter,  # Audio normalization
+        ]
+    
+    def _software_video_args(self) -> List[str]:
+        """Video codec arguments for the CPU encoder chosen by clip.encoder/preset/crf"""
+        clip = self.config.get('clip', {})
+        encoder = clip.get('encoder', 'libx264')
+        defaults = SOFTWARE_ENCODERS.get(encoder, SOFTWARE_ENCODERS['libx264'])
+        return [
+            '-c:v', encoder,
+            '-preset', str(clip.get('preset', defaults['preset'])),
+            '-crf', str(clip.get('crf', defaults['crf'])),
+            '-pix_fmt', 'yuv420p'
+        ]
+    
+    def _encode_9_16(self, input_path: str, output_path: str, duration: int,
+                     video_filter: str, hw: Optional[Dict],
+                     thumb_out: Optional[str] = None, audio_out: Optional[str] = None,
+                     threads: Optional[int] = None, thumb_start: float = 1):
+        """Run the 9:16 encode, on the given hardware encoder or libx264.
+        
+        With thumb_out/audio_out the thumbnail (the source frame at thumb_start
+        seconds) and audio track come out of the same decode instead of separate
+        FFmpeg runs. threads caps FFmpeg's worker threads when several encodes
+        share the machine.
+        """
+        if hw:
+            input_args = hw['input_args']
+            video_filter += hw['filter_suffix']
+            video_args = ['-c:v', hw['encoder'], *hw['quality_args']]
+        else:
+            input_args = []
+            video_args = self._software_video_args()
+        if threads:
+            video_args += ['-threads', str(threads)]
+        
+        audio_args = self._audio_args(input_path, duration)
+        
+        if thumb_out is None and audio_out is None:
+            # Build FFmpeg command for 9:16 transform
+            cmd = [
+                self.ffmpeg_path,
+                *input_args,
+                '-i', input_path,
+                '-t', str(duration),  # Limit duration
+                '-vf', video_filter,
+                *video_args,
+                *audio_args,
+                '-movflags', '+faststart',
+                '-y',  # Overwrite output
+                output_path
+            ]
+        else:
+            # One input, split once: [v] is the vertical clip, [t] the untouched
+            # source frame at thumb_start for the thumbnail
+            graph = f"[0:v]split=2[src][thumb];[src]{video_filter}[v]"
+            if thumb_out:
+                graph += f";[thumb]trim=start={thumb_start},setpts=PTS-STARTPTS[t]"
+            else:
+                graph += ";[thumb]nullsink"
+            
+            cmd = [
+                self.ffmpeg_path,
+                *input_args,
+                '-t', str(duration),  # Limit decoding to the clip for every output
+                '-i', input_path,
+                '-filter_complex', graph,
+                '-map', '[v]', '-map', '0:a?',
+                *video_args,
+                *audio_args,
+                '-movflags', '+faststart',
+                '-y', output_path
+            ]
+            if thumb_out:
+                cmd += ['-map', '[t]', '-frames:v', '1', '-q:v', '2', thumb_out]
+            if audio_out:
+                cmd += ['-map', '0:a?', '-vn', '-c:a', 'aac', '-b:a', '128k', audio_out]
+        
+        self.logger.info(f"Running FFmpeg command: {' '.join(cmd)}")
+        
+        # Run FFmpeg
+        self._run_ffmpeg(cmd)
+    
+    def process_to_9_16(self, input_path: str, output_path: str, duration: int = 60,
+                        threads: Optional[int] = None) -> bool:
         """
         Process video to 9:16 vertical format with smart framing
         
@@ -137,6 +527,7 @@ class VideoProcessor:
             input_path: Input video file path
             output_path: Output video file path
             duration: Target duration in seconds
+            threads: FFmpeg encoder thread cap (None lets FFmpeg decide)
             
         Returns:
             bool: True if successful, False otherwise
@@ -146,39 +537,29 @@ class VideoProcessor:
             
             # Calculate crop parameters
             crop_params = self.calculate_crop_parameters(input_path)
+            video_filter = self._vertical_filter(crop_params)
             
-            # Build FFmpeg command for 9:16 transform
-            cmd = [
-                self.ffmpeg_path,
-                '-i', input_path,
-                '-t', str(duration),  # Limit duration
-                '-vf', f"crop={crop_params['crop_width']}:{crop_params['crop_height']}:{crop_params['crop_x']}:{crop_params['crop_y']},scale=1080:1920:force_original_aspect_ratio=decrease,pad=1080:1920:(ow-iw)/2:(oh-ih)/2:black",
-                '-c:v', 'libx264',
-                '-preset', 'veryfast',
-                '-crf', '23',
-                '-pix_fmt', 'yuv420p',
-                '-c:a', 'aac',
-                '-b:a', '128k',
-                '-ar', '48000',
-                '-ac', '2',
-                '-af', 'loudnorm=I=-16:TP=-1.5:LRA=11',  # Audio normalization
-                '-movflags', '+faststart',
-                '-y',  # Overwrite output
-                output_path
-            ]
-            
-            self.logger.info(f"Running FFmpeg command: {' '.join(cmd)}")
-            
-            # Run FFmpeg
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            
-            if os.path.exists(output_path):
-                file_size = os.path.getsize(output_path)
-                self.logger.info(f"Successfully created {output_path} ({file_size} bytes)")
-                return True
+            hw = self._get_hw_encoder()
+            if hw:
+                try:
+                    self._encode_9_16(input_path, output_path, duration, video_filter, hw,
+                                      threads=threads)
+                except subprocess.CalledProcessError as e:
+                    # Encoder compiled in but no usable device/driver
+                    self.logger.warning(f"{hw['encoder']} encode failed, retrying with the software encoder: {e.stderr}")
+                    self._encode_9_16(input_path, output_path, duration, video_filter, None,
+                                      threads=threads)
             else:
+                self._encode_9_16(input_path, output_path, duration, video_filter, None,
+                                  threads=threads)
+            
+            try:
+                file_size = os.stat(output_path).st_size
+            except FileNotFoundError:
                 self.logger.error("Output file not created")
                 return False
+            self.logger.info(f"Successfully created {output_path} ({file_size} bytes)")
+            return True
                 
         except subprocess.CalledProcessError as e:
             self.logger.error(f"FFmpeg failed: {e}")
@@ -188,20 +569,112 @@ class VideoProcessor:
             self.logger.error(f"Video processing failed: {e}")
             return False
     
+    def process_batch(self, inputs: List[str], outputs: List[str], duration: int = 60,
+                      max_parallel: Optional[int] = None) -> List[bool]:
+        """
+        Process several videos to 9:16 with concurrent FFmpeg processes
+        
+        A single libx264 veryfast encode does not keep a many-core machine busy,
+        so up to max_parallel encodes run side by side, each with its share of
+        the cores. Worker threads only wait on FFmpeg, which releases the GIL.
+        
+        Returns:
+            List[bool]: process_to_9_16 result for each input, in order
+        """
+        if len(inputs) != len(outputs):
+            raise ValueError("inputs and outputs must be the same length")
+        if not inputs:
+            return []
+        
+        cpus = os.cpu_count() or 1
+        if max_parallel is None:
+            max_parallel = max(1, cpus // 4)
+        max_parallel = max(1, min(max_parallel, len(inputs)))
+        threads = max(2, cpus // max_parallel)
+        
+        # Probe the encoder list once up front, not from every worker
+        self._get_hw_encoder()
+        
+        self.logger.info(f"Processing {len(inputs)} clips, {max_parallel} at a time ({threads} threads each)")
+        with ThreadPoolExecutor(max_workers=max_parallel, thread_name_prefix="ffmpeg") as executor:
+            futures = [executor.submit(self.process_to_9_16, src, dst, duration, threads)
+                       for src, dst in zip(inputs, outputs)]
+            return [future.result() for future in futures]
+    
+    def process_all(self, input_path: str, video_out: str, thumb_out: Optional[str] = None,
+                    audio_out: Optional[str] = None, duration: int = 60) -> bool:
+        """
+        Produce the 9:16 clip, thumbnail and audio track in a single FFmpeg run
+        
+        Equivalent to process_to_9_16 + create_thumbnail + extract_audio, but the
+        input is opened and decoded once. The audio track covers the clip duration;
+        it is skipped when the source has no audio. Sources shorter than a second
+        take the thumbnail from the first frame.
+        
+        Returns:
+            bool: True if every output that applies to the source was written, False otherwise
+        """
+        try:
+            self.logger.info(f"Processing {input_path} -> {video_out} (single pass)")
+            
+            try:
+                meta = self.get_video_meta(input_path)
+            except (OSError, subprocess.CalledProcessError, json.JSONDecodeError):
+                meta = None
+            if audio_out and meta and not meta.a_codec:
+                self.logger.warning(f"{input_path} has no audio track, not writing {audio_out}")
+                audio_out = None
+            thumb_start = 1 if meta and meta.duration > 1 else 0
+            
+            crop_params = self.calculate_crop_parameters(input_path)
+            video_filter = self._vertical_filter(crop_params)
+            
+            hw = self._get_hw_encoder()
+            try:
+                self._encode_9_16(input_path, video_out, duration, video_filter, hw,
+                                  thumb_out=thumb_out, audio_out=audio_out, thumb_start=thumb_start)
+            except subprocess.CalledProcessError as e:
+                if not hw:
+                    raise
+                self.logger.warning(f"{hw['encoder']} encode failed, retrying with the software encoder: {e.stderr}")
+                self._encode_9_16(input_path, video_out, duration, video_filter, None,
+                                  thumb_out=thumb_out, audio_out=audio_out, thumb_start=thumb_start)
+            
+            missing = [path for path in (video_out, thumb_out, audio_out)
+                       if path and not os.path.exists(path)]
+            if missing:
+                self.logger.error(f"Outputs not created: {', '.join(missing)}")
+                return False
+            
+            self.logger.info(f"Successfully created {video_out}")
+            return True
+            
+        except subprocess.CalledProcessError as e:
+            self.logger.error(f"FFmpeg failed: {e}")
+            self.logger.error(f"FFmpeg stderr: {e.stderr}")
+            return False
+        except Exception as e:
+            self.logger.error(f"Video processing failed: {e}")
+            return False
+    
     def create_thumbnail(self, input_path: str, output_path: str, time: str = "00:00:05") -> bool:
         """Create thumbnail from video"""
         try:
+            # -ss before -i seeks in the demuxer to the nearest keyframe instead
+            # of decoding everything up to the timestamp
             cmd = [
                 self.ffmpeg_path,
-                '-i', input_path,
                 '-ss', time,
+                '-noaccurate_seek',
+                '-i', input_path,
                 '-vframes', '1',
                 '-q:v', '2',
+                '-an',
                 '-y',
                 output_path
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+            self._run_ffmpeg(cmd)
             
             if os.path.exists(output_path):
                 self.logger.info(f"Created thumbnail: {output_path}")
@@ -227,7 +700,7 @@ class VideoProcessor:
                 output_path
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+            self._run_ffmpeg(cmd)
             
             if os.path.exists(output_path):
                 self.logger.info(f"Extracted audio: {output_path}")
@@ -243,9 +716,7 @@ class VideoProcessor:
     def get_video_duration(self, input_path: str) -> float:
         """Get video duration in seconds"""
         try:
-            video_info = self.get_video_info(input_path)
-            duration_str = video_info.get('format', {}).get('duration', '0')
-            return float(duration_str)
+            return self.get_video_meta(input_path).duration
         except Exception as e:
             self.logger.error(f"Failed to get video duration: {e}")
             return 0.0
@@ -253,21 +724,17 @@ class VideoProcessor:
     def validate_output(self, output_path: str) -> bool:
         """Validate output video file"""
         try:
-            if not os.path.exists(output_path):
+            try:
+                stat = os.stat(output_path)
+            except FileNotFoundError:
                 return False
             
             # Check file size
-            file_size = os.path.getsize(output_path)
-            if file_size < 1024:  # Less than 1KB
+            if stat.st_size < 1024:  # Less than 1KB
                 return False
             
-            # Try to get video info
-            video_info = self.get_video_info(output_path)
-            
             # Check if it has video stream
-            has_video = any(stream.get('codec_type') == 'video' for stream in video_info.get('streams', []))
-            
-            return has_video
+            return self._probe(output_path, stat)[1].v_codec is not None
             
         except Exception as e:
             self.logger.error(f"Output validation failed: {e}")
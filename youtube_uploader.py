@@ -8,31 +8,64 @@ import os
 import sys
 import json
 import logging
+import functools
+import threading
 from pathlib import Path
 from typing import Dict, Optional, List
 
+_GOOGLE_PACKAGES = ("google-api-python-client", "google-auth",
+                    "google-auth-oauthlib", "google-auth-httplib2")
+
+def _ensure_google_libs():
+    """pip-install the Google client libraries (command line / opted-in use only)"""
+    print("Google API libraries not installed. Installing...")
+    import subprocess
+    subprocess.run([sys.executable, "-m", "pip", "install", *_GOOGLE_PACKAGES], check=True)
+
 try:
     from google_auth_oauthlib.flow import InstalledAppFlow
     from google.auth.transport.requests import Request
     from google.oauth2.credentials import Credentials
     from googleapiclient.discovery import build
-    from googleapiclient.http import MediaFileUpload
+    from googleapiclient.http import MediaIoBaseUpload
     from googleapiclient.errors import HttpError
 except ImportError:
-    print("Google API libraries not installed. Installing...")
-    import subprocess
-    subprocess.check_call([sys.executable, "-m", "pip", "install", 
-                          "google-api-python-client", "google-auth", 
-                          "google-auth-oauthlib", "google-auth-httplib2"])
+    # Never pip-install as a side effect of importing this module from the app
+    if __name__ != "__main__" and os.environ.get("TRENDCLIP_AUTO_INSTALL") != "1":
+        raise ImportError("Google API libraries not installed. Run: pip install "
+                          f"{' '.join(_GOOGLE_PACKAGES)}") from None
+    _ensure_google_libs()
     from google_auth_oauthlib.flow import InstalledAppFlow
     from google.auth.transport.requests import Request
     from google.oauth2.credentials import Credentials
     from googleapiclient.discovery import build
-    from googleapiclient.http import MediaFileUpload
+    from googleapiclient.http import MediaIoBaseUpload
     from googleapiclient.errors import HttpError
 
 logger = logging.getLogger(__name__)
 
+# Chunk size for resumable uploads: each chunk is one HTTPS round-trip (must be a
+# multiple of 256 KiB). Not used for the single-request uploads below.
+UPLOAD_CHUNK_SIZE = 16 * 1024 * 1024
+
+# Videos up to this size go up in one multipart request instead of a resumable session
+SIMPLE_UPLOAD_MAX_SIZE = 5 * 1024 * 1024
+
+def open_upload_media(video_path: Path, resumable: bool = True) -> MediaIoBaseUpload:
+    """Open a video for upload, read sequentially and unbuffered
+    
+    resumable=True sends it in UPLOAD_CHUNK_SIZE chunks over a resumable
+    session (drive it with next_chunk()); resumable=False sends the whole file
+    in one multipart request (request.execute()). The caller closes the
+    returned upload's stream (media.stream().close()).
+    """
+    # Unbuffered: each chunk goes from the page cache straight into the request
+    stream = open(video_path, 'rb', buffering=0)
+    if hasattr(os, 'posix_fadvise'):
+        # Ask the kernel for aggressive readahead; not available on Windows
+        os.posix_fadvise(stream.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+    return MediaIoBaseUpload(stream, mimetype='video/*', chunksize=UPLOAD_CHUNK_SIZE, resumable=resumable)
+
 class YouTubeUploader:
     """Handles YouTube video uploads with OAuth authentication"""
     
@@ -51,8 +84,14 @@ class YouTubeUploader:
         self.client_secret_file = self.secrets_dir / "client_secret.json"
         self.token_file = self.secrets_dir / "token.json"
         
-        # YouTube API service
+        # YouTube API service, the credentials it uses and the grant it was built for
         self.youtube = None
+        self._creds = None
+        self._service_grant = None
+        
+        # httplib2 connections are not thread-safe: service and token use is
+        # serialized, but never across the interactive OAuth consent flow
+        self.lock = threading.Lock()
         
     def authenticate(self, installed_app_port: int = 0) -> bool:
         """Authenticate with YouTube API using OAuth"""
@@ -64,33 +103,53 @@ class YouTubeUploader:
                 logger.error("client_secret.json not found")
                 raise FileNotFoundError("client_secret.json not found. Please set up OAuth credentials first.")
             
-            # Create flow
-            flow = InstalledAppFlow.from_client_secrets_file(
-                str(self.client_secret_file), self.SCOPES)
-            
-            # Check if we have valid credentials
-            creds = None
-            if self.token_file.exists():
-                creds = Credentials.from_authorized_user_file(
-                    str(self.token_file), self.SCOPES)
+            with self.lock:
+                # Already authenticated: refresh in place instead of re-reading token.json
+                if self.youtube is not None and self._creds is not None:
+                    if not self._creds.valid and self._creds.refresh_token:
+                        self._creds.refresh(Request())
+                        with open(self.token_file, 'w') as f:
+                            f.write(self._creds.to_json())
+                    if self._creds.valid:
+                        return True
+                
+                # Check if we have valid credentials
+                creds = None
+                if self.token_file.exists():
+                    creds = Credentials.from_authorized_user_file(
+                        str(self.token_file), self.SCOPES)
+                
+                renewed = bool(creds and not creds.valid)
+                if renewed and creds.expired and creds.refresh_token:
+                    creds.refresh(Request())
             
-            # If no valid credentials, let user log in
+            # If no valid credentials, let user log in. The consent page may be left
+            # open indefinitely, so the flow runs without holding the lock.
             if not creds or not creds.valid:
-                if creds and creds.expired and creds.refresh_token:
-                    creds.refresh(Request())
-                else:
-                    logger.info("Running OAuth flow...")
-                    # Run the OAuth flow
-                    creds = flow.run_local_server(port=installed_app_port)
-                
-                # Save credentials
-                with open(self.token_file, 'w') as f:
-                    f.write(creds.to_json())
-                logger.info("OAuth credentials saved")
+                logger.info("Running OAuth flow...")
+                # Create and run the OAuth flow (only needed without a usable token)
+                flow = InstalledAppFlow.from_client_secrets_file(
+                    str(self.client_secret_file), self.SCOPES)
+                creds = flow.run_local_server(port=installed_app_port)
+                renewed = True
             
-            # Build YouTube service
-            self.youtube = build('youtube', 'v3', credentials=creds)
-            logger.info("YouTube API service initialized")
+            with self.lock:
+                # Save credentials
+                if renewed:
+                    with open(self.token_file, 'w') as f:
+                        f.write(creds.to_json())
+                    logger.info("OAuth credentials saved")
+                
+                # Build YouTube service, unless one already exists for this grant (its
+                # credentials refresh themselves, so the refresh token identifies it)
+                grant = creds.refresh_token or creds.token
+                if self.youtube is None or self._service_grant != grant:
+                    # Discovery document bundled with the client library: no fetch, no file cache
+                    self.youtube = build('youtube', 'v3', credentials=creds,
+                                         static_discovery=True, cache_discovery=False)
+                    self._creds = creds
+                    self._service_grant = grant
+                    logger.info("YouTube API service initialized")
             return True
             
         except Exception as e:
@@ -104,11 +163,12 @@ class YouTubeUploader:
                 self.authenticate()
             
             # Test with a simple API call
-            request = self.youtube.channels().list(
-                part="snippet",
-                mine=True
-            )
-            response = request.execute()
+            with self.lock:
+                request = self.youtube.channels().list(
+                    part="snippet",
+                    mine=True
+                )
+                response = request.execute()
             
             if 'items' in response and response['items']:
                 channel = response['items'][0]
@@ -143,7 +203,9 @@ class YouTubeUploader:
                 self.authenticate()
             
             video_path = Path(video_path)
-            if not video_path.exists():
+            try:
+                size = video_path.stat().st_size
+            except FileNotFoundError:
                 raise FileNotFoundError(f"Video file not found: {video_path}")
             
             # Prepare metadata
@@ -164,28 +226,38 @@ class YouTubeUploader:
             if is_short and '#Shorts' not in body['snippet']['title']:
                 body['snippet']['title'] = f"{body['snippet']['title']} #Shorts"
             
-            # Create media upload
-            media = MediaFileUpload(
-                str(video_path), 
-                chunksize=1024*1024, 
-                resumable=True
-            )
+            # Create media upload (Shorts are usually small enough for a single request)
+            resumable = size > SIMPLE_UPLOAD_MAX_SIZE
+            media = open_upload_media(video_path, resumable)
             
             logger.info(f"Uploading video: {video_path.name}")
             
-            # Upload the video
-            request = self.youtube.videos().insert(
-                part=",".join(body.keys()),
-                body=body,
-                media_body=media
-            )
-            
-            # Execute the upload
-            response = None
-            while response is None:
-                status, response = request.next_chunk()
-                if status:
-                    logger.info(f"Uploaded {int(status.progress() * 100)}%")
+            with self.lock:
+                try:
+                    # Upload the video
+                    request = self.youtube.videos().insert(
+                        part=",".join(body.keys()),
+                        body=body,
+                        media_body=media
+                    )
+                
+                    # Execute the upload
+                    if resumable:
+                        response = None
+                        logged_pct = 0
+                        log_progress = logger.isEnabledFor(logging.INFO)
+                        while response is None:
+                            status, response = request.next_chunk()
+                            # Log every 10% rather than every chunk
+                            if status and log_progress:
+                                pct = int(status.progress() * 100)
+                                if pct >= logged_pct + 10:
+                                    logged_pct = pct
+                                    logger.info(f"Uploaded {pct}%")
+                    else:
+                        response = request.execute()
+                finally:
+                    media.stream().close()
             
             logger.info(f"Upload completed: {response['id']}")
             
@@ -209,11 +281,12 @@ class YouTubeUploader:
             if not self.youtube:
                 self.authenticate()
             
-            request = self.youtube.videos().list(
-                part="status,snippet",
-                id=video_id
-            )
-            response = request.execute()
+            with self.lock:
+                request = self.youtube.videos().list(
+                    part="status,snippet",
+                    id=video_id
+                )
+                response = request.execute()
             
             if response['items']:
                 video = response['items'][0]
@@ -238,11 +311,15 @@ class YouTubeUploader:
             }
 
 # Global functions for easy integration
+@functools.lru_cache(maxsize=4)
+def _uploader_for(base_path: str) -> YouTubeUploader:
+    """One uploader per base path, so its authenticated service (and connection) is reused"""
+    return YouTubeUploader(base_path)
+
 def authenticate(installed_app_port: int = 0) -> bool:
     """Global authentication function"""
     base_path = os.environ.get('TRENDCLIP_BASE', os.path.expanduser('~/TrendClipOne'))
-    uploader = YouTubeUploader(base_path)
-    return uploader.authenticate(installed_app_port)
+    return _uploader_for(base_path).authenticate(installed_app_port)
 
 def upload_video(video_path: str, 
                 title: str = "", 
@@ -251,14 +328,12 @@ def upload_video(video_path: str,
                 privacy_status: str = "private") -> Dict:
     """Global upload function"""
     base_path = os.environ.get('TRENDCLIP_BASE', os.path.expanduser('~/TrendClipOne'))
-    uploader = YouTubeUploader(base_path)
-    return uploader.upload_video(video_path, title, description, tags, privacy_status)
+    return _uploader_for(base_path).upload_video(video_path, title, description, tags, privacy_status)
 
 def test_connection() -> Dict:
     """Global test function"""
     base_path = os.environ.get('TRENDCLIP_BASE', os.path.expanduser('~/TrendClipOne'))
-    uploader = YouTubeUploader(base_path)
-    return uploader.test_connection()
+    return _uploader_for(base_path).test_connection()
 
 def main():
     """Command line interface"""